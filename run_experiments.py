@@ -4,17 +4,277 @@ Lance plusieurs simulations avec différents paramètres pour étude de sensibil
 """
 
 import sys
-sys.path.insert(0, '/home/claude/predator_prey_simulation')
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
+# Désactiver l'affichage Pygame et le multithreading BLAS pour mode batch
+# (un thread par processus : le parallélisme se fait au niveau des runs)
+import os
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+
+import argparse
+import hashlib
+import inspect
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import shutil
 import numpy as np
-import matplotlib.pyplot as plt
-from src import Simulation
-from src import config
+import matplotlib
+matplotlib.use('Agg')  # Rendu hors écran (pyplot n'est importé que pour tracer)
+from scipy.signal import find_peaks
+from src import Simulation, BatchSimulation, default_params
 import time
 
-# Désactiver l'affichage Pygame pour mode batch
-import os
-os.environ['SDL_VIDEODRIVER'] = 'dummy'
+# Cache disque des résultats de simulation (un fichier JSON par job)
+CACHE_DIR = Path(__file__).parent / '.cache' / 'sims'
+
+# Dossier des résultats bruts des expériences (.npz)
+DATA_DIR = Path(__file__).parent / 'data'
+
+# Paramètres dont dépendent les résultats d'un run (les paramètres
+# d'affichage, par exemple, n'invalident pas le cache)
+_MODEL_PARAMS = (
+    'GRID_WIDTH', 'GRID_HEIGHT', 'TORUS_MODE',
+    'PROIE_INITIAL_COUNT', 'PROIE_REPRODUCTION_TIME',
+    'PREDATEUR_INITIAL_COUNT', 'PREDATEUR_REPRODUCTION_TIME',
+    'PREDATEUR_INITIAL_ENERGY', 'PREDATEUR_ENERGY_GAIN', 'PREDATEUR_ENERGY_LOSS',
+    'EARLY_STOP_TOL', 'EARLY_STOP_WINDOW', 'EARLY_STOP_MIN_STEPS',
+    'EARLY_STOP_CHECK_INTERVAL', 'RECORD_DATA', 'DATA_RECORD_INTERVAL'
+)
+
+# Journal des runs : les workers l'envoient au processus principal par une
+# file (QueueHandler) au lieu d'écrire chacun sur stdout
+logger = logging.getLogger('sweep')
+
+
+def _init_worker(log_queue):
+    """
+    Initialisation d'un processus du pool : redirige le journal des runs
+    vers la file lue par le processus principal.
+    
+    Args:
+        log_queue: File multiprocessing partagée avec le QueueListener
+    """
+    logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _code_version():
+    """
+    Identifiant de version du code, intégré à la clé de cache pour
+    invalider les résultats quand le modèle change (modifications non
+    commitées comprises).
+    
+    Returns:
+        Empreinte du contenu des sources de la simulation (src/*.py)
+        et des fonctions exécutées par les workers
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted((Path(__file__).resolve().parent / 'src').glob('*.py')):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    for func in (_is_steady, _run_single, _run_batch):
+        digest.update(inspect.getsource(func).encode())
+    return digest.hexdigest()
+
+
+def _job_seed(param_name, value, run_id):
+    """
+    Graine déterministe d'un run, dérivée de ses coordonnées dans le balayage.
+    Deux exécutions du même balayage donnent donc les mêmes trajectoires.
+    
+    Returns:
+        Entier 64 bits
+    """
+    digest = hashlib.blake2b(f"{param_name}|{value}|{run_id}".encode(),
+                             digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _job_key(job, batched, code_version):
+    """
+    Clé de cache déterministe d'un job.
+    
+    Args:
+        job: Dictionnaire décrivant le job (cf. run_experiment)
+        batched: Mode batch (les résultats ne sont pas interchangeables)
+        code_version: Version du code (cf. _code_version)
+    
+    Returns:
+        Empreinte hexadécimale blake2b
+    """
+    defaults = default_params()
+    payload = {
+        'params': {**{name: defaults[name] for name in _MODEL_PARAMS}, **job['params']},
+        'seed': job['seed'],
+        'run_id': job['run_id'],
+        'max_steps': job['max_steps'],
+        'batched': batched,
+        'code_version': code_version
+    }
+    # Un run isolé ne dépend pas du nombre de runs (seulement en mode batch,
+    # où tous les réplicas d'une valeur partagent un générateur)
+    if batched:
+        payload['n_runs'] = job['n_runs']
+    payload = json.dumps(payload, sort_keys=True)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _is_steady(window, tol):
+    """
+    Teste si les populations sont stationnaires sur la fenêtre récente.
+    
+    Args:
+        window: Tableau (n, 2) des couples (proies, predateurs)
+        tol: Seuil du coefficient de variation (std / moyenne)
+    
+    Returns:
+        True si les deux populations varient de moins de `tol`
+    """
+    values = np.asarray(window, dtype=float)
+    mean = values.mean(axis=0)
+    return bool(np.all(values.std(axis=0) < tol * mean))
+
+
+# Simulation réutilisée par tous les jobs d'un même processus (cf. _run_single)
+_worker_sim = None
+
+
+def _run_single(job):
+    """
+    Exécute une simulation indépendante (un couple valeur/run).
+    Fonction de niveau module pour être sérialisable par multiprocessing.
+    
+    Args:
+        job: Dictionnaire {param_name, value, params, max_steps, seed, run_id, n_runs}
+    
+    Returns:
+        Tuple (value, step_count, max_proies, max_predateurs, n_peaks)
+    """
+    global _worker_sim
+    
+    # Paramètres explicites : aucun état global (config) n'est modifié.
+    # La simulation du processus est réinitialisée en place d'un job à l'autre
+    if _worker_sim is None:
+        _worker_sim = Simulation(params=job['params'], seed=job['seed'])
+    else:
+        _worker_sim.reset(seed=job['seed'], params=job['params'])
+    sim = _worker_sim
+    p = sim.params
+    
+    # Exécution, interrompue en cas d'extinction ou de régime stationnaire
+    # (populations quasi constantes : la suite n'apporterait rien). Le test
+    # porte sur la fin de l'historique (enregistrements couvrant la fenêtre)
+    interval = p['DATA_RECORD_INTERVAL']
+    early_stop = p['EARLY_STOP_TOL'] > 0 and p['RECORD_DATA']
+    n_window = max(2, p['EARLY_STOP_WINDOW'] // interval)
+    steady = False
+    for step in range(job['max_steps']):
+        sim.step()
+        
+        if sim.is_extinction():
+            break
+        
+        if (early_stop and
+                sim.step_count >= p['EARLY_STOP_MIN_STEPS'] and
+                sim.step_count % p['EARLY_STOP_CHECK_INTERVAL'] == 0):
+            history = sim.history
+            window = np.column_stack([history['proies'][-n_window:],
+                                      history['predateurs'][-n_window:]])
+            if _is_steady(window, p['EARLY_STOP_TOL']):
+                steady = True
+                break
+    
+    # Un run stationnaire aurait survécu jusqu'au bout
+    survival = job['max_steps'] if steady else sim.step_count
+    
+    # Collecte des métriques (historique NumPy, tronqué à la fin du run).
+    # Maxima : la suite d'un run stationnaire reste dans la fenêtre
+    # (variation < EARLY_STOP_TOL), ils sont donc inchangés
+    history = sim.history
+    proies = history['proies']
+    max_proies = int(proies.max()) if proies.size else 0
+    max_pred = int(history['predateurs'].max()) if proies.size else 0
+    
+    # Détection de cycles simplifiée
+    if len(proies) > 10:
+        peaks, _ = find_peaks(proies, distance=10)
+        n_peaks = len(peaks)
+    else:
+        n_peaks = 0
+    
+    # Run stationnaire : les pics de la fenêtre finale sont prolongés
+    # jusqu'à max_steps, pour rester comparable aux runs complets
+    if steady:
+        tail = proies[-n_window:]
+        tail_peaks = len(find_peaks(tail, distance=10)[0])
+        remaining = (job['max_steps'] - sim.step_count) // interval
+        n_peaks += round(tail_peaks * remaining / tail.size)
+    
+    logger.info("   [%s=%s] Run %d/%d: %d steps%s, Proies_max=%d, Cycles=%d",
+                job['param_name'], job['value'], job['run_id'] + 1, job['n_runs'],
+                sim.step_count, ' (stationnaire)' if steady else '',
+                max_proies, n_peaks)
+    
+    return (job['value'], survival, max_proies, max_pred, n_peaks)
+
+
+def _run_batch(job):
+    """
+    Exécute tous les runs d'une même valeur en un seul BatchSimulation
+    (réplicas vectorisés avec NumPy).
+    
+    Args:
+        job: Dictionnaire {param_name, value, params, max_steps, seed, n_runs}
+    
+    Returns:
+        Liste de tuples (value, step_count, max_proies, max_predateurs, n_peaks)
+    """
+    sim = BatchSimulation(job['n_runs'], params=job['params'], seed=job['seed'])
+    sim.run(job['max_steps'])
+    
+    # Longueurs utiles (valeurs figées après extinction ignorées)
+    history = sim.history
+    lengths = sim.step_counts + 1
+    proies_mat = history['proies']
+    valid = np.arange(proies_mat.shape[1]) < lengths[:, None]
+    max_proies = np.where(valid, proies_mat, 0).max(axis=1)
+    max_pred = np.where(valid, history['predateurs'], 0).max(axis=1)
+    peaks_counts = np.array([
+        len(find_peaks(row[:n], distance=10)[0]) if n > 10 else 0
+        for row, n in zip(proies_mat, lengths)
+    ])
+    
+    outputs = []
+    for run in range(job['n_runs']):
+        logger.info("   [%s=%s] Run %d/%d: %d steps, Proies_max=%d, Cycles=%d",
+                    job['param_name'], job['value'], run + 1, job['n_runs'],
+                    sim.step_counts[run], max_proies[run], peaks_counts[run])
+        
+        outputs.append((job['value'], int(sim.step_counts[run]),
+                        int(max_proies[run]), int(max_pred[run]),
+                        int(peaks_counts[run])))
+    
+    return outputs
+
+
+def _run_indexed(task):
+    """
+    Exécute un job en conservant son indice (résultats reçus dans le
+    désordre avec imap_unordered).
+    
+    Args:
+        task: Tuple (indice, job, batched)
+    
+    Returns:
+        Tuple (indice, résultat du job)
+    """
+    i, job, batched = task
+    return i, (_run_batch if batched else _run_single)(job)
 
 
 class ExperimentRunner:
@@ -23,10 +283,50 @@ class ExperimentRunner:
     Permet de tester systématiquement différentes configurations.
     """
     
-    def __init__(self):
+    def __init__(self, n_workers=None, cache_dir=CACHE_DIR):
+        """
+        Args:
+            n_workers: Nombre de processus parallèles (None = tous les cœurs)
+            cache_dir: Dossier du cache des résultats (None = pas de cache)
+        """
         self.results = []
+        self.n_workers = n_workers or os.cpu_count()
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._code_version = _code_version()
     
-    def run_experiment(self, param_name, param_values, n_runs=3, max_steps=1000):
+    def _load_cached(self, key):
+        """Retourne le résultat en cache pour `key`, ou None."""
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / f"{key}.json"
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+    
+    def _store_cached(self, key, output):
+        """
+        Enregistre le résultat d'un job dans le cache. L'écriture est
+        atomique (fichier temporaire puis renommage) : une interruption
+        ne laisse jamais de fichier partiel.
+        """
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{key}.json"
+        tmp = path.with_suffix('.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(output, f)
+        os.replace(tmp, path)
+    
+    def invalidate_cache(self):
+        """Supprime tous les résultats en cache."""
+        if self.cache_dir is not None and self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
+            print(f"🗑️ Cache supprimé : {self.cache_dir}")
+    
+    def run_experiment(self, param_name, param_values, n_runs=3, max_steps=1000,
+                       batched=False):
         """
         Lance une série de simulations en faisant varier un paramètre.
         
@@ -35,6 +335,8 @@ class ExperimentRunner:
             param_values: Liste des valeurs à tester
             n_runs: Nombre de répétitions par valeur (pour moyenner)
             max_steps: Nombre maximum de steps par simulation
+            batched: True pour simuler les n_runs d'une valeur ensemble
+                     (BatchSimulation, mise à jour synchrone vectorisée)
         
         Returns:
             Dictionnaire de résultats
@@ -42,9 +344,6 @@ class ExperimentRunner:
         print(f"\n🔬 EXPÉRIENCE : Impact de {param_name}")
         print("=" * 70)
         
-        # Sauvegarder la valeur originale
-        original_value = getattr(config, param_name)
-        
         results = {
             'param_name': param_name,
             'param_values': param_values,
@@ -54,61 +353,102 @@ class ExperimentRunner:
             'cycles_detected': []
         }
         
+        # Un job indépendant par couple (valeur, run),
+        # ou par valeur en mode batch (les runs sont des réplicas)
+        jobs = [
+            {
+                'param_name': param_name,
+                'value': value,
+                'params': {
+                    param_name: value,
+                    'MAX_STEPS': max_steps,
+                    'RECORD_DATA': True
+                },
+                'max_steps': max_steps,
+                'seed': _job_seed(param_name, value, run),
+                'run_id': run,
+                'n_runs': n_runs
+            }
+            for value in param_values
+            for run in range(1 if batched else n_runs)
+        ]
+        
+        # Seuls les jobs absents du cache sont exécutés
+        keys = [_job_key(job, batched, self._code_version) for job in jobs]
+        cached = [self._load_cached(key) for key in keys]
+        pending = [i for i, out in enumerate(cached) if out is None]
+        
+        print(f"📊 {len(pending)} tâches réparties sur {self.n_workers} processus "
+              f"({len(jobs) - len(pending)} en cache)")
+        
+        if pending:
+            # Un seul thread du processus principal écrit le journal des runs
+            console = logging.StreamHandler(sys.stdout)
+            console.setFormatter(logging.Formatter('%(message)s'))
+            log_queue = multiprocessing.Queue()
+            listener = logging.handlers.QueueListener(log_queue, console)
+            listener.start()
+            try:
+                with multiprocessing.Pool(processes=self.n_workers,
+                                          initializer=_init_worker,
+                                          initargs=(log_queue,)) as pool:
+                    # Chaque résultat est mis en cache dès sa réception : un
+                    # balayage interrompu reprend là où il s'était arrêté
+                    tasks = [(i, jobs[i], batched) for i in pending]
+                    for i, out in pool.imap_unordered(_run_indexed, tasks):
+                        self._store_cached(keys[i], out)
+                        cached[i] = out
+            finally:
+                listener.stop()
+        
+        if batched:
+            outputs = [tuple(out) for batch in cached for out in batch]
+        else:
+            outputs = [tuple(out) for out in cached]
+        
+        # Regroupement des runs par valeur (dans l'ordre des jobs)
+        by_value = {value: [] for value in param_values}
+        for value, step_count, max_proies, max_pred, n_peaks in outputs:
+            by_value[value].append((step_count, max_proies, max_pred, n_peaks))
+        
+        # Moyennes
         for value in param_values:
-            print(f"\n📊 Test avec {param_name} = {value}")
-            
-            survival_times_run = []
-            max_proies_run = []
-            max_pred_run = []
-            cycles_run = []
-            
-            # Répétitions pour statistiques
-            for run in range(n_runs):
-                # Modifier le paramètre
-                setattr(config, param_name, value)
-                config.MAX_STEPS = max_steps
-                config.RECORD_DATA = True
-                
-                # Nouvelle simulation
-                sim = Simulation()
-                
-                # Exécution
-                for step in range(max_steps):
-                    sim.step()
-                    
-                    if sim.is_extinction():
-                        break
-                
-                # Collecte des métriques
-                survival_times_run.append(sim.step_count)
-                max_proies_run.append(max(sim.history['proies']) if sim.history['proies'] else 0)
-                max_pred_run.append(max(sim.history['predateurs']) if sim.history['predateurs'] else 0)
-                
-                # Détection de cycles simplifiée
-                proies = np.array(sim.history['proies'])
-                if len(proies) > 10:
-                    from scipy.signal import find_peaks
-                    peaks, _ = find_peaks(proies, distance=10)
-                    cycles_run.append(len(peaks))
-                else:
-                    cycles_run.append(0)
-                
-                print(f"   Run {run+1}/{n_runs}: {sim.step_count} steps, "
-                      f"Proies_max={max(sim.history['proies'])}, "
-                      f"Cycles={cycles_run[-1]}")
-            
-            # Moyennes
+            survival_times_run, max_proies_run, max_pred_run, cycles_run = zip(*by_value[value])
             results['survival_times'].append(np.mean(survival_times_run))
             results['max_proies'].append(np.mean(max_proies_run))
             results['max_predateurs'].append(np.mean(max_pred_run))
             results['cycles_detected'].append(np.mean(cycles_run))
         
-        # Restaurer la valeur originale
-        setattr(config, param_name, original_value)
-        
         self.results.append(results)
         return results
     
+    def save_results(self, results, path):
+        """
+        Sauvegarde les résultats bruts d'une expérience (format .npz).
+        Le tracé se fait ensuite séparément (cf. plot_results_from_file).
+        
+        Args:
+            results: Dictionnaire de résultats (cf. run_experiment)
+            path: Chemin du fichier .npz
+        """
+        np.savez_compressed(path, **results)
+        print(f"\n💾 Résultats sauvegardés : {path}")
+    
+    @staticmethod
+    def load_results(path):
+        """
+        Recharge des résultats sauvegardés par save_results.
+        
+        Args:
+            path: Chemin du fichier .npz
+        
+        Returns:
+            Dictionnaire de résultats
+        """
+        with np.load(path) as data:
+            results = {key: data[key].tolist() for key in data.files}
+        return results
+    
     def plot_results(self, results, save_path=None):
         """
         Génère des graphiques de l'expérience.
@@ -117,6 +457,8 @@ class ExperimentRunner:
             results: Dictionnaire de résultats
             save_path: Chemin de sauvegarde (optionnel)
         """
+        import matplotlib.pyplot as plt
+        
         param_name = results['param_name']
         param_values = results['param_values']
         
@@ -167,13 +509,30 @@ class ExperimentRunner:
             plt.show()
 
 
-def main():
-    """Lancement des expériences prédéfinies."""
+def plot_results_from_file(path):
+    """
+    Trace une expérience à partir de ses résultats sauvegardés.
+    Le graphique est enregistré à côté du fichier (.png).
     
+    Args:
+        path: Chemin du fichier .npz
+    """
+    runner = ExperimentRunner(cache_dir=None)
+    results = runner.load_results(path)
+    runner.plot_results(results, save_path=Path(path).with_suffix('.png'))
+
+
+def run_sweeps(invalidate=False):
+    """Lancement des expériences prédéfinies (sauvegarde des résultats bruts)."""
     print("🚀 LANCEMENT DES EXPÉRIMENTATIONS AUTOMATIQUES")
     print("=" * 70)
     
     runner = ExperimentRunner()
+    if invalidate:
+        runner.invalidate_cache()
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    exp1_path = DATA_DIR / 'exp1_proie_reproduction.npz'
+    exp2_path = DATA_DIR / 'exp2_predateur_energy.npz'
     
     # Expérience 1 : Impact du temps de reproduction des proies
     print("\n" + "="*70)
@@ -187,10 +546,7 @@ def main():
         max_steps=1000
     )
     
-    runner.plot_results(
-        results1,
-        save_path='/home/claude/predator_prey_simulation/data/exp1_proie_reproduction.png'
-    )
+    runner.save_results(results1, exp1_path)
     
     # Expérience 2 : Impact de l'énergie initiale des prédateurs
     print("\n" + "="*70)
@@ -204,19 +560,42 @@ def main():
         max_steps=1000
     )
     
-    runner.plot_results(
-        results2,
-        save_path='/home/claude/predator_prey_simulation/data/exp2_predateur_energy.png'
-    )
+    runner.save_results(results2, exp2_path)
     
     # Résumé final
     print("\n" + "="*70)
     print("✅ EXPÉRIMENTATIONS TERMINÉES")
     print("="*70)
-    print("\n📊 Résultats disponibles dans le dossier data/")
-    print("📈 Graphiques générés :")
-    print("   • exp1_proie_reproduction.png")
-    print("   • exp2_predateur_energy.png")
+    print(f"\n📊 Résultats disponibles dans le dossier {DATA_DIR}")
+    print(f"   • {exp1_path.name}")
+    print(f"   • {exp2_path.name}")
+    print("\n📈 Pour générer les graphiques :")
+    print(f"   python run_experiments.py plot {exp1_path} {exp2_path}")
+
+
+def main(argv=None):
+    """
+    Point d'entrée en ligne de commande.
+    
+    Usage :
+        python run_experiments.py [--invalidate]   # Lance les expériences
+        python run_experiments.py plot FICHIER...  # Trace des résultats .npz
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--invalidate', action='store_true',
+                        help="Vider le cache des simulations avant de lancer")
+    subparsers = parser.add_subparsers(dest='command')
+    plot_parser = subparsers.add_parser(
+        'plot', help="Tracer des résultats sauvegardés (.npz)"
+    )
+    plot_parser.add_argument('files', nargs='+', help="Fichiers .npz à tracer")
+    args = parser.parse_args(argv)
+    
+    if args.command == 'plot':
+        for path in args.files:
+            plot_results_from_file(path)
+    else:
+        run_sweeps(invalidate=args.invalidate)
 
 
 if __name__ == "__main__":
@@ -8,7 +8,8 @@ __author__ = "Votre Nom"
 
 from agents import Animal, Proie, Predateur
 from grid import Grid
-from simulation import Simulation
+from simulation import Simulation, default_params, merge_params
+from batch_simulation import BatchSimulation
 from analysis import SimulationAnalyzer
 
 __all__ = [
@@ -17,5 +18,8 @@ __all__ = [
     'Predateur',
     'Grid',
     'Simulation',
+    'default_params',
+    'merge_params',
+    'BatchSimulation',
     'SimulationAnalyzer'
 ]
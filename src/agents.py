@@ -6,6 +6,20 @@ Architecture OOP : Animal (classe abstraite) -> Proie / Predateur
 import random
 from abc import ABC, abstractmethod
 from typing import Tuple, Optional
+import config
+
+
+# Tables de tirage d'un voisin dans un masque 4 bits (cf. Grid.empty_mask) :
+# nombre de bits à 1, et indice du k-ième bit à 1, pour chaque masque
+_POPCOUNT = tuple(bin(mask).count('1') for mask in range(16))
+_NTH_SETBIT = tuple(
+    tuple(d for d in range(4) if mask >> d & 1) for mask in range(16)
+)
+
+
+def _pick_direction(mask: int, rng: random.Random) -> int:
+    """Tire uniformément une direction parmi les bits à 1 de `mask` (non nul)."""
+    return _NTH_SETBIT[mask][rng.randrange(_POPCOUNT[mask])]
 
 
 class Animal(ABC):
@@ -14,6 +28,10 @@ class Animal(ABC):
     Toutes les espèces héritent de cette classe.
     """
     
+    # Identifiant de l'espèce dans la grille (défini par chaque sous-classe) :
+    # une lecture d'attribut au lieu d'un isinstance dans les boucles chaudes
+    symbol = 0
+    
     def __init__(self, x: int, y: int, reproduction_time: int):
         """
         Initialise un animal à une position donnée.
@@ -30,13 +48,14 @@ class Animal(ABC):
         self.is_alive = True
     
     @abstractmethod
-    def move(self, grid: 'Grid') -> Tuple[int, int]:
+    def move(self, grid: 'Grid', rng: random.Random = random) -> Tuple[int, int]:
         """
         Détermine la prochaine position de l'animal.
         Méthode abstraite à implémenter dans les sous-classes.
         
         Args:
             grid: Référence à la grille de simulation
+            rng: Générateur aléatoire (module random par défaut)
             
         Returns:
             Tuple (new_x, new_y) de la nouvelle position
@@ -74,24 +93,27 @@ class Proie(Animal):
     Comportement : Fuite, Reproduction simple
     """
     
+    symbol = config.PROIE_SYMBOL
+    
     def __init__(self, x: int, y: int, reproduction_time: int):
         super().__init__(x, y, reproduction_time)
     
-    def move(self, grid: 'Grid') -> Tuple[int, int]:
+    def move(self, grid: 'Grid', rng: random.Random = random) -> Tuple[int, int]:
         """
         Déplacement aléatoire vers une case vide adjacente (Von Neumann).
         
         Args:
             grid: Référence à la grille
+            rng: Générateur aléatoire
             
         Returns:
             Nouvelle position (x, y)
         """
-        empty_neighbors = grid.get_empty_neighbors(self.x, self.y)
+        mask = grid.empty_mask(self.x, self.y)
         
-        if empty_neighbors:
+        if mask:
             # Choisir aléatoirement parmi les cases vides
-            return random.choice(empty_neighbors)
+            return grid.neighbor(self.x, self.y, _pick_direction(mask, rng))
         else:
             # Pas de case vide : rester sur place
             return (self.x, self.y)
@@ -120,6 +142,8 @@ class Predateur(Animal):
     Comportement : Chasse, Métabolisme énergétique, Reproduction conditionnelle
     """
     
+    symbol = config.PREDATEUR_SYMBOL
+    
     def __init__(self, x: int, y: int, reproduction_time: int, 
                  initial_energy: int, energy_gain: int, energy_loss: int):
         super().__init__(x, y, reproduction_time)
@@ -127,27 +151,28 @@ class Predateur(Animal):
         self.energy_gain = energy_gain
         self.energy_loss = energy_loss
     
-    def move(self, grid: 'Grid') -> Tuple[int, int]:
+    def move(self, grid: 'Grid', rng: random.Random = random) -> Tuple[int, int]:
         """
         Déplacement intelligent : priorité aux cases avec des proies.
         
         Args:
             grid: Référence à la grille
+            rng: Générateur aléatoire
             
         Returns:
             Nouvelle position (x, y)
         """
         # Chercher des proies dans le voisinage
-        prey_neighbors = grid.get_prey_neighbors(self.x, self.y)
+        mask = grid.prey_mask(self.x, self.y)
         
-        if prey_neighbors:
+        if mask:
             # Chasse : aller vers une proie
-            return random.choice(prey_neighbors)
+            return grid.neighbor(self.x, self.y, _pick_direction(mask, rng))
         else:
             # Errance : déplacement aléatoire vers case vide
-            empty_neighbors = grid.get_empty_neighbors(self.x, self.y)
-            if empty_neighbors:
-                return random.choice(empty_neighbors)
+            mask = grid.empty_mask(self.x, self.y)
+            if mask:
+                return grid.neighbor(self.x, self.y, _pick_direction(mask, rng))
             else:
                 return (self.x, self.y)  # Rester sur place
     
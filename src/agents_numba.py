@@ -0,0 +1,195 @@
+"""
+Version compilée (Numba) du cycle de vie des agents.
+Les agents sont stockés dans des tableaux parallèles (x, y, énergie, ...)
+au lieu d'objets Python, ce qui permet de compiler la boucle principale.
+Sans Numba, les mêmes fonctions s'exécutent en Python pur.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba est optionnel : repli en Python pur
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Décorateur neutre utilisé quand Numba n'est pas installé."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Symboles de la grille (cf. config.PROIE_SYMBOL / PREDATEUR_SYMBOL)
+PROIE = 1
+PREDATEUR = 2
+
+# Types entiers réduits des tableaux d'agents (cf. Grid.__init__)
+POS_DTYPE = np.int16        # x, y : grilles jusqu'à 32767 cases de côté
+ENERGY_DTYPE = np.int16
+REPRO_DTYPE = np.int8
+ID_DTYPE = np.int32         # Indice + 1 des agents dans la grille des ids
+ENERGY_MAX = np.iinfo(ENERGY_DTYPE).max
+REPRO_MAX = np.iinfo(REPRO_DTYPE).max
+
+# Voisinage de Von Neumann (dx, dy) : Haut, Bas, Droite, Gauche.
+# Table unique partagée par Grid, BatchSimulation et le noyau : l'indice
+# d'une direction est aussi son bit dans les masques de voisins
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+_DX = np.array([dx for dx, _ in DIRECTIONS], dtype=np.int64)
+_DY = np.array([dy for _, dy in DIRECTIONS], dtype=np.int64)
+
+# Tirage d'une direction dans un masque 4 bits (cf. agents._NTH_SETBIT,
+# utilisé aussi par BatchSimulation).
+# Un entier uniforme dans [0, RAND_RANGE) modulo le nombre de candidats (1 à 4)
+# reste uniforme car RAND_RANGE = ppcm(1, 2, 3, 4)
+RAND_RANGE = 12
+POPCOUNT = np.array([bin(m).count('1') for m in range(16)], dtype=np.int64)
+NTH_SETBIT = np.array(
+    [[d for d in range(4) if m >> d & 1] + [-1] * (4 - bin(m).count('1'))
+     for m in range(16)],
+    dtype=np.int64
+)
+
+
+@njit(cache=True)
+def _neighbor(x, y, d, wrap_x, wrap_y):
+    """
+    Coordonnées du voisin d'indice `d`, lues dans les tables de
+    Grid._wrap_x / _wrap_y (pas de modulo ni de test de topologie).
+    """
+    return wrap_x[x + 1 + _DX[d]], wrap_y[y + 1 + _DY[d]]
+
+
+@njit(cache=True)
+def _neighbor_mask(cells, x, y, target, wrap_x, wrap_y):
+    """Masque 4 bits des voisins dont la case vaut `target`."""
+    mask = 0
+    for d in range(4):
+        nx, ny = _neighbor(x, y, d, wrap_x, wrap_y)
+        if cells[ny, nx] == target:
+            mask |= 1 << d
+    return mask
+
+
+@njit(cache=True)
+def _pick_neighbor(cells, x, y, target, wrap_x, wrap_y, r):
+    """
+    Choisit aléatoirement un voisin dont la case vaut `target`
+    (sans allocation : masque de bits + table de correspondance).
+    
+    Args:
+        r: Entier aléatoire pré-tiré dans [0, RAND_RANGE)
+    
+    Returns:
+        (nx, ny) ou (-1, -1) si aucun voisin ne convient
+    """
+    mask = _neighbor_mask(cells, x, y, target, wrap_x, wrap_y)
+    if mask == 0:
+        return -1, -1
+    d = NTH_SETBIT[mask, r % POPCOUNT[mask]]
+    return _neighbor(x, y, d, wrap_x, wrap_y)
+
+
+@njit(cache=True)
+def step_numba(cells, ids, xs, ys, energies, repro_counters, species, alive,
+               n, counts, order, rand, births,
+               proie_reproduction_time, predateur_reproduction_time,
+               energy_gain, energy_loss, wrap_x, wrap_y):
+    """
+    Exécute déplacements, actions et naissances sur les agents en tableaux.
+    Mêmes règles que les classes Proie / Predateur de agents.py.
+    
+    Args:
+        cells: Grille (H, W) des symboles (modifiée en place)
+        ids: Grille (H, W) des indices d'agents + 1 (0 = vide)
+        xs, ys, energies, repro_counters, species, alive: Tableaux des agents
+            (types POS_DTYPE, ENERGY_DTYPE, REPRO_DTYPE, int8, bool)
+        n: Nombre d'agents (tous vivants en entrée)
+        counts: Populations [proies, prédateurs] (mises à jour en place)
+        order: Permutation aléatoire de range(n) (ordre de traitement)
+        rand: 2 * n entiers pré-tirés dans [0, RAND_RANGE) : rand[k] pour
+            le k-ième agent traité, rand[n + b] pour la b-ième naissance
+        births: Tampon réutilisé d'au moins n entiers (parents du step)
+        proie_reproduction_time, predateur_reproduction_time,
+        energy_gain, energy_loss: Paramètres du modèle
+        wrap_x, wrap_y: Tables des coordonnées voisines (Grid._wrap_x, _wrap_y)
+    
+    Returns:
+        Nombre d'agents, morts compris (à compacter par Grid.remove_dead)
+    """
+    n_births = 0
+    
+    # Phase 2 : Déplacement et actions
+    for k in range(order.size):
+        i = order[k]
+        if not alive[i]:
+            continue
+        
+        # Vieillissement (saturé : seul le seuil de reproduction compte)
+        if repro_counters[i] < REPRO_MAX:
+            repro_counters[i] += 1
+        
+        # Déplacement : un prédateur chasse en priorité
+        x = xs[i]
+        y = ys[i]
+        nx, ny = -1, -1
+        if species[i] == PREDATEUR:
+            nx, ny = _pick_neighbor(cells, x, y, PROIE, wrap_x, wrap_y, rand[k])
+        if nx < 0:
+            nx, ny = _pick_neighbor(cells, x, y, 0, wrap_x, wrap_y, rand[k])
+        
+        if nx >= 0:
+            if cells[ny, nx] == PROIE:
+                # Prédateur mange proie
+                alive[ids[ny, nx] - 1] = False
+                counts[PROIE - 1] -= 1
+                if energies[i] > ENERGY_MAX - energy_gain:
+                    energies[i] = ENERGY_MAX
+                else:
+                    energies[i] += energy_gain
+            cells[y, x] = 0
+            ids[y, x] = 0
+            cells[ny, nx] = species[i]
+            ids[ny, nx] = i + 1
+            xs[i] = nx
+            ys[i] = ny
+        
+        # Métabolisme et reproduction
+        if species[i] == PREDATEUR:
+            energies[i] -= energy_loss
+            if energies[i] <= 0:
+                alive[i] = False  # Mort par famine (reste sur la grille)
+                counts[PREDATEUR - 1] -= 1
+            if (repro_counters[i] >= predateur_reproduction_time and
+                    energies[i] > energy_gain * 2):
+                repro_counters[i] = 0
+                energies[i] //= 2
+                births[n_births] = i
+                n_births += 1
+        elif repro_counters[i] >= proie_reproduction_time:
+            repro_counters[i] = 0
+            births[n_births] = i
+            n_births += 1
+    
+    # Phase 3 : Placement des nouveaux-nés sur une case vide adjacente
+    total = n
+    for b in range(n_births):
+        parent = births[b]
+        nx, ny = _pick_neighbor(cells, xs[parent], ys[parent], 0,
+                                wrap_x, wrap_y, rand[n + b])
+        if nx < 0:
+            continue
+        xs[total] = nx
+        ys[total] = ny
+        energies[total] = energies[parent]
+        repro_counters[total] = 0
+        species[total] = species[parent]
+        alive[total] = True
+        cells[ny, nx] = species[parent]
+        ids[ny, nx] = total + 1
+        total += 1
+        counts[species[parent] - 1] += 1
+    
+    # Phase 4 (retrait des morts) : Grid.remove_dead, vectorisée
+    return total
@@ -3,10 +3,85 @@ Module d'analyse statistique et visualisation des résultats.
 Comparaison avec le modèle de Lotka-Volterra.
 """
 
+import math
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.integrate import odeint
+from scipy.signal import find_peaks
 from typing import Dict, List
+from agents_numba import njit
+
+
+@njit(cache=True)
+def mean_std_min_max(a):
+    """
+    Moyenne, écart-type, minimum et maximum en un seul parcours du tableau.
+    
+    Args:
+        a: Tableau 1D non vide
+        
+    Returns:
+        Tuple (mean, std, min, max)
+    """
+    s = 0.0
+    ss = 0.0
+    mn = a[0]
+    mx = a[0]
+    for v in a:
+        f = float(v)
+        s += f
+        ss += f * f
+        if v < mn:
+            mn = v
+        elif v > mx:
+            mx = v
+    n = a.size
+    mean = s / n
+    return mean, math.sqrt(max(ss / n - mean * mean, 0.0)), mn, mx
+
+
+@njit(cache=True)
+def _lotka_volterra_rates(x, y, alpha, beta, gamma, delta):
+    """Dérivées (dx/dt, dy/dt) du système de Lotka-Volterra."""
+    return alpha * x - beta * x * y, delta * x * y - gamma * y
+
+
+@njit(cache=True)
+def lotka_volterra_rk4(x0, y0, t, alpha, beta, gamma, delta, substeps=10):
+    """
+    Intègre Lotka-Volterra par Runge-Kutta d'ordre 4 à pas fixe.
+    
+    Args:
+        x0, y0: Populations initiales (proies, prédateurs)
+        t: Instants de sortie (croissants, t[0] = instant initial)
+        alpha, beta, gamma, delta: Paramètres du modèle
+        substeps: Nombre de pas RK4 entre deux instants de sortie
+        
+    Returns:
+        Tuple (X, Y) des populations aux instants t
+    """
+    n = t.size
+    X = np.empty(n)
+    Y = np.empty(n)
+    x = float(x0)
+    y = float(y0)
+    X[0] = x
+    Y[0] = y
+    
+    for i in range(n - 1):
+        h = (t[i + 1] - t[i]) / substeps
+        for _ in range(substeps):
+            k1x, k1y = _lotka_volterra_rates(x, y, alpha, beta, gamma, delta)
+            k2x, k2y = _lotka_volterra_rates(x + 0.5 * h * k1x, y + 0.5 * h * k1y,
+                                             alpha, beta, gamma, delta)
+            k3x, k3y = _lotka_volterra_rates(x + 0.5 * h * k2x, y + 0.5 * h * k2y,
+                                             alpha, beta, gamma, delta)
+            k4x, k4y = _lotka_volterra_rates(x + h * k3x, y + h * k3y,
+                                             alpha, beta, gamma, delta)
+            x += h / 6.0 * (k1x + 2.0 * k2x + 2.0 * k3x + k4x)
+            y += h / 6.0 * (k1y + 2.0 * k2y + 2.0 * k3y + k4y)
+        X[i + 1] = x
+        Y[i + 1] = y
+    
+    return X, Y
 
 
 class SimulationAnalyzer:
@@ -34,6 +109,8 @@ class SimulationAnalyzer:
         Args:
             save_path: Chemin pour sauvegarder l'image (None = affichage)
         """
+        import matplotlib.pyplot as plt
+        
         fig, ax = plt.subplots(figsize=(12, 6))
         
         ax.plot(self.steps, self.proies, label='Proies', color='green', linewidth=2)
@@ -61,6 +138,8 @@ class SimulationAnalyzer:
         Args:
             save_path: Chemin de sauvegarde
         """
+        import matplotlib.pyplot as plt
+        
         fig, ax = plt.subplots(figsize=(8, 8))
         
         # Tracé avec gradient de couleur (temps)
@@ -108,23 +187,17 @@ class SimulationAnalyzer:
             delta: Efficacité de conversion proie->prédateur
             save_path: Chemin de sauvegarde
         """
-        def lotka_volterra(state, t):
-            """Système d'EDO de Lotka-Volterra."""
-            x, y = state  # x = proies, y = prédateurs
-            dx = alpha * x - beta * x * y
-            dy = delta * x * y - gamma * y
-            return [dx, dy]
+        import matplotlib.pyplot as plt
         
         # Conditions initiales (normalisation)
         x0 = self.proies[0]
         y0 = self.predateurs[0]
         
-        # Résolution numérique (Runge-Kutta)
+        # Résolution numérique (Runge-Kutta d'ordre 4 à pas fixe)
         t_theory = np.linspace(0, self.steps[-1], len(self.steps))
-        solution = odeint(lotka_volterra, [x0, y0], t_theory)
-        
-        x_theory = solution[:, 0]
-        y_theory = solution[:, 1]
+        x_theory, y_theory = lotka_volterra_rk4(
+            x0, y0, t_theory, alpha, beta, gamma, delta
+        )
         
         # Affichage comparatif
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
@@ -172,25 +245,14 @@ class SimulationAnalyzer:
         Returns:
             Dictionnaire de statistiques
         """
-        stats = {
-            'proies': {
-                'mean': np.mean(self.proies),
-                'std': np.std(self.proies),
-                'min': np.min(self.proies),
-                'max': np.max(self.proies)
-            },
-            'predateurs': {
-                'mean': np.mean(self.predateurs),
-                'std': np.std(self.predateurs),
-                'min': np.min(self.predateurs),
-                'max': np.max(self.predateurs)
-            },
-            'duration': len(self.steps)
-        }
+        stats = {'duration': len(self.steps)}
         
-        # Détection de cycles (simplifiée : pics locaux)
-        from scipy.signal import find_peaks
+        # Un seul parcours par série (au lieu de mean/std/min/max séparés)
+        for name, values in (('proies', self.proies), ('predateurs', self.predateurs)):
+            mean, std, mn, mx = mean_std_min_max(values)
+            stats[name] = {'mean': mean, 'std': std, 'min': mn, 'max': mx}
         
+        # Détection de cycles (simplifiée : pics locaux)
         peaks_proies, _ = find_peaks(self.proies, distance=10)
         peaks_pred, _ = find_peaks(self.predateurs, distance=10)
         
@@ -0,0 +1,264 @@
+"""
+Simulation vectorisée de plusieurs réplicas indépendants (mode batch).
+Tous les mondes Wa-Tor évoluent en parallèle dans des tableaux NumPy (R, H, W).
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Optional
+from simulation import merge_params
+from agents_numba import DIRECTIONS, RAND_RANGE, POPCOUNT, NTH_SETBIT
+import config
+
+
+class BatchSimulation:
+    """
+    Exécute `n_replicas` simulations identiques (mêmes paramètres, tirages
+    aléatoires différents) en une seule série d'opérations NumPy.
+    
+    Contrairement à Simulation (agents traités un par un dans un ordre
+    aléatoire), la mise à jour est synchrone : tous les prédateurs se
+    déplacent simultanément, puis toutes les proies, puis les naissances.
+    Les conflits (deux agents visant la même case) sont résolus en faveur
+    du premier candidat dans un ordre aléatoire.
+    """
+    
+    def __init__(self, n_replicas: int, params: Optional[Dict[str, Any]] = None,
+                 seed: Optional[int] = None):
+        """
+        Initialise les réplicas.
+        
+        Args:
+            n_replicas: Nombre de simulations menées en parallèle
+            params: Paramètres surchargeant ceux de config (cf. Simulation)
+            seed: Graine du générateur aléatoire (None = RANDOM_SEED)
+        """
+        self.params = merge_params(params)
+        self.n_replicas = n_replicas
+        
+        self.rng = np.random.default_rng(
+            seed if seed is not None else self.params['RANDOM_SEED']
+        )
+        
+        p = self.params
+        self.width = p['GRID_WIDTH']
+        self.height = p['GRID_HEIGHT']
+        shape = (n_replicas, self.height, self.width)
+        
+        # État des grilles (0=vide, 1=proie, 2=prédateur)
+        self.cells = np.zeros(shape, dtype=np.int8)
+        self.energy = np.zeros(shape, dtype=np.int32)
+        self.reproduction_counter = np.zeros(shape, dtype=np.int32)
+        
+        # Directions autorisées par case (bords exclus si pas torique)
+        self._valid = np.ones((4, self.height, self.width), dtype=bool)
+        if not p['TORUS_MODE']:
+            ys, xs = np.indices((self.height, self.width))
+            for d, (dx, dy) in enumerate(DIRECTIONS):
+                self._valid[d] = ((0 <= xs + dx) & (xs + dx < self.width) &
+                                  (0 <= ys + dy) & (ys + dy < self.height))
+        
+        # Indice à plat (dans les R grilles) de la case voisine de chaque case
+        # pour chaque direction (torique ; les directions hors grille sont
+        # exclues par _valid)
+        ys, xs = np.indices((self.height, self.width))
+        offsets = np.arange(n_replicas)[:, None, None] * (self.height * self.width)
+        self._targets = np.stack([
+            (offsets + ((ys + dy) % self.height) * self.width + (xs + dx) % self.width).ravel()
+            for dx, dy in DIRECTIONS
+        ])
+        
+        # Compteurs par réplica
+        self.step_counts = np.zeros(n_replicas, dtype=np.int64)
+        self.active = np.ones(n_replicas, dtype=bool)
+        self._counts: List[np.ndarray] = []
+        
+        self._initialize_populations()
+    
+    @staticmethod
+    def _neighbor(a: np.ndarray, dx: int, dy: int) -> np.ndarray:
+        """Valeur de `a` en (x+dx, y+dy) pour chaque case (x, y) (torique)."""
+        return np.roll(a, (-dy, -dx), axis=(-2, -1))
+    
+    @staticmethod
+    def _shift(a: np.ndarray, dx: int, dy: int) -> np.ndarray:
+        """Déplace chaque valeur de `a` de (x, y) vers (x+dx, y+dy) (torique)."""
+        return np.roll(a, (dy, dx), axis=(-2, -1))
+    
+    def _initialize_populations(self):
+        """Peuplement initial aléatoire, sans collision, de chaque réplica."""
+        p = self.params
+        total_cells = self.width * self.height
+        n_proies = p['PROIE_INITIAL_COUNT']
+        n_pred = p['PREDATEUR_INITIAL_COUNT']
+        
+        if n_proies + n_pred > total_cells:
+            raise ValueError(
+                f"Trop d'animaux ({n_proies + n_pred}) pour la grille ({total_cells} cases)"
+            )
+        
+        for r in range(self.n_replicas):
+            flat = self.rng.choice(total_cells, size=n_proies + n_pred, replace=False)
+            self.cells[r].flat[flat[:n_proies]] = config.PROIE_SYMBOL
+            self.cells[r].flat[flat[n_proies:]] = config.PREDATEUR_SYMBOL
+            self.energy[r].flat[flat[n_proies:]] = p['PREDATEUR_INITIAL_ENERGY']
+        
+        self._record_statistics()
+    
+    def _resolve_moves(self, movers: np.ndarray, allowed: np.ndarray) -> List[np.ndarray]:
+        """
+        Choisit une direction par agent puis résout les conflits de cible.
+        Travaille sur la liste des candidats (indices à plat) plutôt que sur
+        les grilles entières : sur chaque cible, le premier candidat d'une
+        permutation aléatoire l'emporte.
+        
+        Args:
+            movers: Masque (R, H, W) des agents qui veulent bouger
+            allowed: Masque (4, R, H, W) des directions autorisées
+        
+        Returns:
+            Pour chaque direction, masque des cases sources dont le
+            déplacement est accepté
+        """
+        # Choix uniforme parmi les directions autorisées : masque 4 bits par
+        # case, puis un entier tiré dans [0, RAND_RANGE) modulo le nombre de
+        # directions désigne directement la direction (cf. agents_numba)
+        mask = np.zeros(movers.shape, dtype=np.uint8)
+        for d in range(4):
+            mask |= allowed[d].view(np.uint8) << d
+        count = POPCOUNT[mask]
+        src = np.flatnonzero(movers & (count > 0))
+        r = self.rng.integers(0, RAND_RANGE, size=src.size, dtype=np.int8)
+        choice = NTH_SETBIT[mask.ravel()[src], r % count.ravel()[src]]
+        target = self._targets[choice, src]
+        
+        # Première occurrence de chaque cible dans un ordre aléatoire
+        order = self.rng.permutation(src.size)
+        _, first = np.unique(target[order], return_index=True)
+        won = order[first]
+        
+        winners = np.zeros(allowed.shape, dtype=bool)
+        winners.reshape(4, -1)[choice[won], src[won]] = True
+        return list(winners)
+    
+    def _apply_moves(self, winners: List[np.ndarray]) -> np.ndarray:
+        """
+        Déplace les agents sélectionnés vers leur case cible.
+        
+        Returns:
+            Masque des cases d'arrivée
+        """
+        arrived = np.zeros_like(self.cells, dtype=bool)
+        for d, (dx, dy) in enumerate(DIRECTIONS):
+            src = winners[d]
+            if not src.any():
+                continue
+            dst = self._shift(src, dx, dy)
+            for field in (self.cells, self.energy, self.reproduction_counter):
+                np.copyto(field, self._shift(field, dx, dy), where=dst)
+                field[src] = 0
+            arrived |= dst
+        return arrived
+    
+    def _allowed(self, target: np.ndarray) -> np.ndarray:
+        """Directions (4, R, H, W) menant à une case vérifiant `target`."""
+        return np.stack([
+            self._neighbor(target, dx, dy) & self._valid[d]
+            for d, (dx, dy) in enumerate(DIRECTIONS)
+        ])
+    
+    def step(self):
+        """
+        Exécute un cycle de simulation sur tous les réplicas actifs.
+        Ordre : Vieillissement -> Prédateurs -> Proies -> Métabolisme -> Naissances
+        """
+        p = self.params
+        active = self.active[:, None, None]
+        self.step_counts[self.active] += 1
+        
+        # Vieillissement
+        self.reproduction_counter[(self.cells != 0) & active] += 1
+        
+        # Prédateurs : chasse en priorité, sinon errance vers une case vide
+        predateurs = (self.cells == config.PREDATEUR_SYMBOL) & active
+        prey_dirs = self._allowed(self.cells == config.PROIE_SYMBOL)
+        empty_dirs = self._allowed(self.cells == 0)
+        allowed = np.where(prey_dirs.any(axis=0), prey_dirs, empty_dirs)
+        
+        eaten = self.cells == config.PROIE_SYMBOL
+        arrived = self._apply_moves(self._resolve_moves(predateurs, allowed))
+        self.energy[arrived & eaten] += p['PREDATEUR_ENERGY_GAIN']
+        
+        # Proies : fuite vers une case vide
+        proies = (self.cells == config.PROIE_SYMBOL) & active
+        self._apply_moves(self._resolve_moves(proies, self._allowed(self.cells == 0)))
+        
+        # Métabolisme et mort par famine
+        predateurs = (self.cells == config.PREDATEUR_SYMBOL) & active
+        self.energy[predateurs] -= p['PREDATEUR_ENERGY_LOSS']
+        dead = predateurs & (self.energy <= 0)
+        self.cells[dead] = 0
+        self.energy[dead] = 0
+        self.reproduction_counter[dead] = 0
+        
+        # Reproduction : le nouveau-né occupe une case vide adjacente
+        parents = active & (
+            ((self.cells == config.PROIE_SYMBOL) &
+             (self.reproduction_counter >= p['PROIE_REPRODUCTION_TIME'])) |
+            ((self.cells == config.PREDATEUR_SYMBOL) &
+             (self.reproduction_counter >= p['PREDATEUR_REPRODUCTION_TIME']) &
+             (self.energy > p['PREDATEUR_ENERGY_GAIN'] * 2))
+        )
+        self.reproduction_counter[parents] = 0
+        self.energy[parents] //= 2
+        
+        winners = self._resolve_moves(parents, self._allowed(self.cells == 0))
+        for d, (dx, dy) in enumerate(DIRECTIONS):
+            dst = self._shift(winners[d], dx, dy)
+            np.copyto(self.cells, self._shift(self.cells, dx, dy), where=dst)
+            np.copyto(self.energy, self._shift(self.energy, dx, dy), where=dst)
+        
+        # Statistiques et détection d'extinction par réplica
+        proies_count, predateurs_count = self._record_statistics()
+        self.active &= (proies_count > 0) & (predateurs_count > 0)
+    
+    def _record_statistics(self):
+        """Enregistre les populations de chaque réplica."""
+        counts = np.stack([
+            np.count_nonzero(self.cells == config.PROIE_SYMBOL, axis=(1, 2)),
+            np.count_nonzero(self.cells == config.PREDATEUR_SYMBOL, axis=(1, 2))
+        ])
+        self._counts.append(counts)
+        return counts[0], counts[1]
+    
+    def run(self, max_steps: int) -> 'BatchSimulation':
+        """
+        Fait évoluer les réplicas jusqu'à extinction ou `max_steps` cycles.
+        
+        Args:
+            max_steps: Nombre maximum de cycles
+        
+        Returns:
+            L'instance elle-même (pour chaînage)
+        """
+        for _ in range(max_steps):
+            if not self.active.any():
+                break
+            self.step()
+        return self
+    
+    @property
+    def history(self) -> Dict[str, np.ndarray]:
+        """
+        Historique des populations de tous les réplicas.
+        
+        Returns:
+            Dictionnaire {'step': (T,), 'proies': (R, T), 'predateurs': (R, T)}.
+            Seules les `step_counts[r] + 1` premières valeurs de la ligne r
+            sont significatives (le réplica est figé après extinction).
+        """
+        counts = np.stack(self._counts, axis=-1)
+        return {
+            'step': np.arange(counts.shape[-1]),
+            'proies': counts[0],
+            'predateurs': counts[1]
+        }
@@ -27,6 +27,17 @@ PREDATEUR_SYMBOL = 2             # Identifiant dans la grille
 SIMULATION_SPEED = 5           # Pas de simulation par seconde (FPS logique)
 MAX_STEPS = 5000                 # Nombre maximum de cycles (0 = infini)
 RANDOM_SEED = None               # Seed pour reproductibilité (None = aléatoire)
+USE_NUMBA = True                 # Noyau compilé Numba si disponible (sinon Python pur)
+
+# Arrêt anticipé des expériences en régime stationnaire (run_experiments.py)
+# Désactivé par défaut : avec la configuration par défaut les populations
+# oscillent (std/moyenne >= 0.1 sur toute fenêtre de 200 steps), aucun run
+# n'atteindrait un seuil de quelques %. À activer (ex. 0.02) pour des
+# paramètres menant à un équilibre stable.
+EARLY_STOP_TOL = 0.0             # Seuil std/moyenne des deux populations (0 = désactivé)
+EARLY_STOP_WINDOW = 200          # Fenêtre glissante (steps) pour std/moyenne
+EARLY_STOP_MIN_STEPS = 500       # Pas de test avant ce step
+EARLY_STOP_CHECK_INTERVAL = 50   # Fréquence du test (steps)
 
 # ==================== PARAMÈTRES D'AFFICHAGE ====================
 WINDOW_WIDTH = 800               # Largeur de la fenêtre Pygame
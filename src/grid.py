@@ -4,8 +4,10 @@ Optimisation : NumPy pour les opérations vectorisées.
 """
 
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 from agents import Animal, Proie, Predateur
+from agents_numba import (DIRECTIONS, POS_DTYPE, ENERGY_DTYPE, REPRO_DTYPE,
+                          ID_DTYPE, ENERGY_MAX, REPRO_MAX)
 import config
 
 
@@ -15,6 +17,10 @@ class Grid:
     Stocke les agents et gère les interactions spatiales.
     """
     
+    # Voisinage de Von Neumann : Haut, Bas, Droite, Gauche
+    # (l'indice d'une direction est aussi son bit dans les masques de voisins)
+    DIRECTIONS = DIRECTIONS
+    
     def __init__(self, width: int, height: int, torus: bool = True):
         """
         Initialise une grille vide.
@@ -31,13 +37,57 @@ class Grid:
         # Matrice NumPy pour affichage rapide (0=vide, 1=proie, 2=prédateur)
         self.cells = np.zeros((height, width), dtype=np.int8)
         
-        # Dictionnaire pour stocker les références aux agents
-        # Clé : (x, y), Valeur : Agent
-        self.agents: dict[Tuple[int, int], Animal] = {}
+        # Agents en tableaux parallèles (Structure of Arrays) : l'agent i est
+        # décrit par x[i], y[i], energy[i], ...
+        # Les agents vivants occupent les indices [0, n_agents).
+        # Morts et nouveaux-nés coexistent pendant un step : 2 agents max par case
+        capacity = 2 * width * height
+        self.agent_arrays = {
+            'x': np.empty(capacity, dtype=POS_DTYPE),
+            'y': np.empty(capacity, dtype=POS_DTYPE),
+            'energy': np.zeros(capacity, dtype=ENERGY_DTYPE),
+            'repro': np.zeros(capacity, dtype=REPRO_DTYPE),
+            'species': np.zeros(capacity, dtype=np.int8),
+            'alive': np.zeros(capacity, dtype=np.bool_)
+        }
+        self.n_agents = 0
+        
+        # Indice + 1 de l'agent (tableaux) occupant chaque case (0 = vide)
+        self.ids = np.zeros((height, width), dtype=ID_DTYPE)
+        
+        # Populations [proies, prédateurs] tenues à jour à chaque ajout,
+        # retrait ou naissance (indice = symbole - 1)
+        self._counts = np.zeros(2, dtype=np.int64)
+        
+        # Paramètres des espèces, pour convertir les agents en objets
+        # Proie / Predateur (remplacés par ceux de la Simulation)
+        self.agent_params: Dict[str, Any] = {
+            'PROIE_REPRODUCTION_TIME': config.PROIE_REPRODUCTION_TIME,
+            'PREDATEUR_REPRODUCTION_TIME': config.PREDATEUR_REPRODUCTION_TIME,
+            'PREDATEUR_ENERGY_GAIN': config.PREDATEUR_ENERGY_GAIN,
+            'PREDATEUR_ENERGY_LOSS': config.PREDATEUR_ENERGY_LOSS
+        }
+        
+        # Topologie fixée à la construction : variantes de get_neighbors et
+        # _wrap_position sans test de self.torus à chaque appel
+        self.get_neighbors = self._neighbors_torus if torus else self._neighbors_clamp
+        self._wrap_position = self._wrap_torus if torus else self._wrap_clamp
+        
+        # Tables de voisinage : _wrap_x[x + 1 + dx] est l'abscisse voisine de
+        # x pour dx dans {-1, 0, 1} (idem en y), repliée ou bornée selon
+        # la topologie. Utilisées par le noyau compilé (agents_numba).
+        xs = np.arange(-1, width + 1, dtype=np.int32)
+        ys = np.arange(-1, height + 1, dtype=np.int32)
+        if torus:
+            self._wrap_x, self._wrap_y = xs % width, ys % height
+        else:
+            self._wrap_x = np.clip(xs, 0, width - 1)
+            self._wrap_y = np.clip(ys, 0, height - 1)
     
     def _wrap_position(self, x: int, y: int) -> Tuple[int, int]:
         """
         Applique l'arithmétique modulaire pour la topologie torique.
+        Remplacée à la construction par _wrap_torus ou _wrap_clamp.
         
         Args:
             x, y: Coordonnées brutes
@@ -46,23 +96,30 @@ class Grid:
             Coordonnées "wrappées" dans [0, width) x [0, height)
         """
         if self.torus:
-            return (x % self.width, y % self.height)
-        else:
-            # Clamp aux bords si pas torique
-            return (max(0, min(x, self.width - 1)), 
-                    max(0, min(y, self.height - 1)))
+            return self._wrap_torus(x, y)
+        return self._wrap_clamp(x, y)
+    
+    def _wrap_torus(self, x: int, y: int) -> Tuple[int, int]:
+        """_wrap_position en topologie torique."""
+        return (x % self.width, y % self.height)
+    
+    def _wrap_clamp(self, x: int, y: int) -> Tuple[int, int]:
+        """_wrap_position avec bords bornés."""
+        return (max(0, min(x, self.width - 1)), 
+                max(0, min(y, self.height - 1)))
     
     def is_empty(self, x: int, y: int) -> bool:
         """Vérifie si une case est vide."""
-        return self.cells[y, x] == 0
+        return self.cells.item(y, x) == 0
     
     def is_prey(self, x: int, y: int) -> bool:
         """Vérifie si une case contient une proie."""
-        return self.cells[y, x] == config.PROIE_SYMBOL
+        return self.cells.item(y, x) == config.PROIE_SYMBOL
     
     def get_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
         """
         Retourne les 4 voisins (Von Neumann) d'une position.
+        Remplacée à la construction par _neighbors_torus ou _neighbors_clamp.
         
         Args:
             x, y: Position centrale
@@ -70,28 +127,72 @@ class Grid:
         Returns:
             Liste des positions voisines
         """
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]  # Haut, Bas, Droite, Gauche
-        neighbors = []
-        
-        for dx, dy in directions:
-            nx, ny = self._wrap_position(x + dx, y + dy)
-            neighbors.append((nx, ny))
+        if self.torus:
+            return self._neighbors_torus(x, y)
+        return self._neighbors_clamp(x, y)
+    
+    def _neighbors_torus(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """get_neighbors en topologie torique (modulo en ligne)."""
+        w, h = self.width, self.height
+        return [((x + dx) % w, (y + dy) % h) for dx, dy in self.DIRECTIONS]
+    
+    def _neighbors_clamp(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """get_neighbors avec bords bornés (une case au bord est sa propre voisine)."""
+        xmax, ymax = self.width - 1, self.height - 1
+        return [(max(0, min(x + dx, xmax)), max(0, min(y + dy, ymax)))
+                for dx, dy in self.DIRECTIONS]
+    
+    def neighbor(self, x: int, y: int, direction: int) -> Tuple[int, int]:
+        """
+        Retourne le voisin de (x, y) dans une direction donnée.
         
-        return neighbors
+        Args:
+            x, y: Position centrale
+            direction: Indice dans DIRECTIONS
+            
+        Returns:
+            Position voisine (x, y)
+        """
+        dx, dy = self.DIRECTIONS[direction]
+        return self._wrap_position(x + dx, y + dy)
+    
+    def _neighbor_mask(self, x: int, y: int, value: int) -> int:
+        """Masque 4 bits des voisins dont la case vaut `value` (bit d = direction d)."""
+        item = self.cells.item
+        mask = 0
+        for d, (nx, ny) in enumerate(self.get_neighbors(x, y)):
+            if item(ny, nx) == value:
+                mask |= 1 << d
+        return mask
+    
+    def _neighbors_with(self, x: int, y: int, value: int) -> List[Tuple[int, int]]:
+        """
+        Voisins dont la case vaut `value`, en une seule lecture de `cells`
+        par voisin (item() évite la création d'un scalaire NumPy).
+        """
+        item = self.cells.item
+        return [(nx, ny) for nx, ny in self.get_neighbors(x, y) if item(ny, nx) == value]
+    
+    def empty_mask(self, x: int, y: int) -> int:
+        """Masque 4 bits des voisins vides (sans construire de liste)."""
+        return self._neighbor_mask(x, y, 0)
+    
+    def prey_mask(self, x: int, y: int) -> int:
+        """Masque 4 bits des voisins contenant une proie."""
+        return self._neighbor_mask(x, y, config.PROIE_SYMBOL)
     
     def get_empty_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
         """Retourne uniquement les voisins vides."""
-        neighbors = self.get_neighbors(x, y)
-        return [pos for pos in neighbors if self.is_empty(*pos)]
+        return self._neighbors_with(x, y, 0)
     
     def get_prey_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
         """Retourne uniquement les voisins contenant des proies."""
-        neighbors = self.get_neighbors(x, y)
-        return [pos for pos in neighbors if self.is_prey(*pos)]
+        return self._neighbors_with(x, y, config.PROIE_SYMBOL)
     
     def add_agent(self, agent: Animal):
         """
-        Ajoute un agent à la grille.
+        Ajoute un agent (objet) à la grille : copié dans les tableaux
+        d'agents, l'objet lui-même n'est pas conservé.
         
         Args:
             agent: Instance de Proie ou Predateur
@@ -99,27 +200,31 @@ class Grid:
         x, y = agent.x, agent.y
         
         # Déterminer le symbole
-        if isinstance(agent, Proie):
-            symbol = config.PROIE_SYMBOL
-        elif isinstance(agent, Predateur):
-            symbol = config.PREDATEUR_SYMBOL
-        else:
+        symbol = agent.symbol
+        if not symbol:
             raise ValueError(f"Type d'agent inconnu : {type(agent)}")
         
-        # Mise à jour de la grille
-        self.cells[y, x] = symbol
-        self.agents[(x, y)] = agent
+        # Un agent déjà présent sur la case est remplacé
+        self.remove_agent(x, y)
+        
+        energy = min(getattr(agent, 'energy', 0), ENERGY_MAX)
+        i = self.spawn(x, y, symbol, energy)
+        self.agent_arrays['repro'][i] = min(agent.reproduction_counter, REPRO_MAX)
     
     def remove_agent(self, x: int, y: int):
         """
-        Retire un agent de la grille.
+        Retire un agent de la grille (les tableaux sont compactés).
         
         Args:
             x, y: Position de l'agent à retirer
         """
-        if (x, y) in self.agents:
-            del self.agents[(x, y)]
-            self.cells[y, x] = 0
+        i = self.ids[y, x] - 1
+        if i < 0:
+            return
+        
+        self.agent_arrays['alive'][i] = False
+        self._counts[self.cells[y, x] - 1] -= 1
+        self.remove_dead(self.n_agents)
     
     def move_agent(self, old_pos: Tuple[int, int], new_pos: Tuple[int, int]):
         """
@@ -129,37 +234,137 @@ class Grid:
             old_pos: Ancienne position (x, y)
             new_pos: Nouvelle position (x, y)
         """
-        if old_pos not in self.agents:
+        (x, y), (nx, ny) = old_pos, new_pos
+        if self.ids[y, x] == 0:
             return
         
-        agent = self.agents[old_pos]
-        
         # Gestion de la collision : si la nouvelle case est occupée
-        if new_pos in self.agents:
-            target = self.agents[new_pos]
-            
+        if self.ids[ny, nx]:
             # Prédateur mange proie
-            if isinstance(agent, Predateur) and isinstance(target, Proie):
-                agent.eat()
-                self.remove_agent(*new_pos)  # Retire la proie
+            if (self.cells[y, x] == config.PREDATEUR_SYMBOL and
+                    self.cells[ny, nx] == config.PROIE_SYMBOL):
+                self.remove_agent(nx, ny)  # Retire la proie
+                energy = self.agent_arrays['energy']
+                i = self.ids[y, x] - 1  # Indice décalé par le compactage
+                energy[i] = min(int(energy[i]) + self.agent_params['PREDATEUR_ENERGY_GAIN'],
+                                ENERGY_MAX)
             else:
                 # Collision non autorisée : annuler le déplacement
                 return
         
         # Déplacement effectif
-        self.remove_agent(*old_pos)
-        agent.x, agent.y = new_pos
-        self.add_agent(agent)
+        i = self.ids[y, x] - 1
+        self.cells[ny, nx] = self.cells[y, x]
+        self.ids[ny, nx] = i + 1
+        self.cells[y, x] = 0
+        self.ids[y, x] = 0
+        self.agent_arrays['x'][i] = nx
+        self.agent_arrays['y'][i] = ny
+    
+    def spawn(self, xs, ys, symbol: int, energy: int = 0) -> np.ndarray:
+        """
+        Ajoute des agents d'une même espèce au stockage en tableaux
+        (cases supposées vides), en une seule écriture vectorisée.
+        
+        Args:
+            xs, ys: Positions des agents (scalaires ou tableaux)
+            symbol: PROIE_SYMBOL ou PREDATEUR_SYMBOL
+            energy: Énergie initiale (prédateurs)
+            
+        Returns:
+            Indices des agents dans les tableaux
+        """
+        xs = np.atleast_1d(xs)
+        ys = np.atleast_1d(ys)
+        start = self.n_agents
+        end = start + xs.size
+        indices = np.arange(start, end)
+        
+        a = self.agent_arrays
+        a['x'][start:end] = xs
+        a['y'][start:end] = ys
+        a['energy'][start:end] = energy
+        a['repro'][start:end] = 0
+        a['species'][start:end] = symbol
+        a['alive'][start:end] = True
+        self.cells[ys, xs] = symbol
+        self.ids[ys, xs] = indices + 1
+        self.n_agents = end
+        self._counts[symbol - 1] += xs.size
+        return indices
+    
+    def remove_dead(self, total: int):
+        """
+        Retire les agents morts des tableaux en une passe vectorisée :
+        libère leurs cases puis compacte les survivants (ordre conservé)
+        dans [0, n_agents).
+        
+        Args:
+            total: Nombre d'agents (vivants et morts) dans les tableaux
+        """
+        a = self.agent_arrays
+        alive = a['alive'][:total]
+        dead = np.flatnonzero(~alive)
+        
+        # Une proie mangée a déjà été remplacée par son prédateur :
+        # seule la case encore attribuée au mort est libérée
+        dx = a['x'][dead]
+        dy = a['y'][dead]
+        own = self.ids[dy, dx] == dead + 1
+        self.cells[dy[own], dx[own]] = 0
+        self.ids[dy[own], dx[own]] = 0
+        
+        survivors = np.flatnonzero(alive)
+        n = survivors.size
+        if n < total:
+            for values in a.values():
+                values[:n] = values[survivors]
+            self.ids[a['y'][:n], a['x'][:n]] = np.arange(1, n + 1)
+        self.n_agents = n
+    
+    def _to_object(self, i: int) -> Animal:
+        """Copie de l'agent d'indice `i` sous forme d'objet Proie / Predateur."""
+        a = self.agent_arrays
+        p = self.agent_params
+        x, y = int(a['x'][i]), int(a['y'][i])
+        if a['species'][i] == config.PREDATEUR_SYMBOL:
+            agent = Predateur(
+                x, y,
+                p['PREDATEUR_REPRODUCTION_TIME'],
+                int(a['energy'][i]),
+                p['PREDATEUR_ENERGY_GAIN'],
+                p['PREDATEUR_ENERGY_LOSS']
+            )
+        else:
+            agent = Proie(x, y, p['PROIE_REPRODUCTION_TIME'])
+        agent.reproduction_counter = int(a['repro'][i])
+        return agent
     
     def get_agent(self, x: int, y: int) -> Optional[Animal]:
-        """Retourne l'agent à la position donnée."""
-        return self.agents.get((x, y))
+        """
+        Retourne une copie de l'agent situé en (x, y) sous forme d'objet
+        Proie/Predateur (modifier l'objet n'a pas d'effet sur la grille).
+        
+        Args:
+            x, y: Position sur la grille
+        
+        Returns:
+            L'agent ou None si la case est vide
+        """
+        i = self.ids[y, x] - 1
+        if i < 0:
+            return None
+        return self._to_object(i)
     
     def get_all_agents(self) -> List[Animal]:
-        """Retourne tous les agents vivants."""
-        return list(self.agents.values())
+        """Retourne une copie (objets) de tous les agents vivants."""
+        alive = np.flatnonzero(self.agent_arrays['alive'][:self.n_agents])
+        return [self._to_object(i) for i in alive]
     
     def clear(self):
         """Vide complètement la grille."""
         self.cells.fill(0)
-        self.agents.clear()
+        self.ids.fill(0)
+        self.agent_arrays['alive'][:self.n_agents] = False
+        self.n_agents = 0
+        self._counts.fill(0)
@@ -5,6 +5,7 @@ Contrôles : Pause/Reprise, Vitesse, Réinitialisation.
 
 import pygame
 import sys
+import time
 from simulation import Simulation
 from pathlib import Path
 from agents import Proie, Predateur
@@ -32,7 +33,6 @@ class PygameViewer:
         )
         pygame.display.set_caption("Simulation Proie-Prédateur (Wa-Tor)")
         
-        self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
         
@@ -43,10 +43,62 @@ class PygameViewer:
         
         # Contrôle de vitesse
         self.speed_multiplier = 1.0  # 1x par défaut
+        
+        # Rendu à refaire (grille ou HUD modifiés depuis le dernier affichage)
+        self._dirty = True
+        
+        # HUD : textes fixes rendus une fois, valeurs composées de glyphes
+        # mis en cache (la rastérisation des polices est coûteuse)
+        self._glyphs = {}
+        self._info_background = pygame.Surface((config.WINDOW_WIDTH, 120))
+        self._info_background.set_alpha(180)
+        self._info_background.fill((0, 0, 0))
+        self._pause_surface = self.font.render("PAUSE", True, (255, 255, 0))
+        controls = [
+            "ESPACE: Pause | R: Reset | I: Info",
+            "UpArrow/DownArrow: Vitesse | ESC: Quitter"
+        ]
+        self._control_surfaces = [
+            self.small_font.render(control, True, (150, 150, 150))
+            for control in controls
+        ]
+        
+        # Rendu de la grille : surfaces 8 bits à palette indexée par symbole,
+        # les symboles de `cells` sont copiés tels quels (pas d'image RVB
+        # intermédiaire), une case par pixel agrandie en une seule opération
+        n_symbols = max(config.PROIE_SYMBOL, config.PREDATEUR_SYMBOL) + 1
+        palette = [config.EMPTY_COLOR] * n_symbols
+        palette[config.PROIE_SYMBOL] = config.PROIE_COLOR
+        palette[config.PREDATEUR_SYMBOL] = config.PREDATEUR_COLOR
+        
+        grid = self.simulation.grid
+        size = (grid.width * config.CELL_SIZE, grid.height * config.CELL_SIZE)
+        self._cells_surface = pygame.Surface((grid.width, grid.height), depth=8)
+        self._grid_surface = pygame.Surface(size, depth=8)
+        for surface in (self._cells_surface, self._grid_surface):
+            surface.set_palette(palette)
+        
+        # Optionnel : grille de séparation, dessinée une fois sur un calque
+        self._grid_lines = None
+        if config.SHOW_GRID and config.CELL_SIZE > 2:
+            self._grid_lines = pygame.Surface(size)
+            self._grid_lines.set_colorkey((0, 0, 0))
+            for y in range(grid.height):
+                for x in range(grid.width):
+                    rect = pygame.Rect(
+                        x * config.CELL_SIZE,
+                        y * config.CELL_SIZE,
+                        config.CELL_SIZE,
+                        config.CELL_SIZE
+                    )
+                    pygame.draw.rect(self._grid_lines, (50, 50, 50), rect, 1)
     
     def handle_events(self):
         """Gestion des événements clavier et souris."""
         for event in pygame.event.get():
+            # Tout événement (touche, fenêtre ré-exposée...) force un rendu
+            self._dirty = True
+            
             if event.type == pygame.QUIT:
                 self.running = False
             
@@ -80,32 +132,43 @@ class PygameViewer:
         """Affiche la grille avec les agents colorés."""
         self.screen.fill(config.BACKGROUND_COLOR)
         
-        # Dessiner chaque cellule
-        for y in range(config.GRID_HEIGHT):
-            for x in range(config.GRID_WIDTH):
-                cell_value = self.simulation.grid.cells[y, x]
-                
-                # Déterminer la couleur
-                if cell_value == config.PROIE_SYMBOL:
-                    color = config.PROIE_COLOR
-                elif cell_value == config.PREDATEUR_SYMBOL:
-                    color = config.PREDATEUR_COLOR
-                else:
-                    color = config.EMPTY_COLOR
-                
-                # Calculer la position du rectangle
-                rect = pygame.Rect(
-                    x * config.CELL_SIZE,
-                    y * config.CELL_SIZE,
-                    config.CELL_SIZE,
-                    config.CELL_SIZE
-                )
-                
-                pygame.draw.rect(self.screen, color, rect)
-                
-                # Optionnel : grille de séparation
-                if config.SHOW_GRID and config.CELL_SIZE > 2:
-                    pygame.draw.rect(self.screen, (50, 50, 50), rect, 1)
+        # Symboles copiés en indices de palette (surfarray attend (x, y) :
+        # vue transposée, sans copie)
+        pygame.surfarray.blit_array(self._cells_surface, self.simulation.grid.cells.T)
+        
+        # Agrandissement au plus proche voisin : une case = CELL_SIZE pixels
+        pygame.transform.scale(self._cells_surface, self._grid_surface.get_size(),
+                               self._grid_surface)
+        self.screen.blit(self._grid_surface, (0, 0))
+        
+        if self._grid_lines is not None:
+            self.screen.blit(self._grid_lines, (0, 0))
+    
+    def _text(self, text: str, color) -> pygame.Surface:
+        """
+        Rendu d'un texte (libellé ou caractère), mis en cache.
+        
+        Args:
+            text: Texte à rendre
+            color: Couleur RVB
+        
+        Returns:
+            Surface du texte
+        """
+        key = (text, color)
+        surface = self._glyphs.get(key)
+        if surface is None:
+            surface = self.small_font.render(text, True, color)
+            self._glyphs[key] = surface
+        return surface
+    
+    def _blit_line(self, label: str, value: str, color, y: int):
+        """Affiche un libellé suivi d'une valeur composée caractère par caractère."""
+        x = 10
+        for part in (label, *value):
+            surface = self._text(part, color)
+            self.screen.blit(surface, (x, y))
+            x += surface.get_width()
     
     def draw_info(self):
         """Affiche les informations de simulation (HUD)."""
@@ -115,67 +178,69 @@ class PygameViewer:
         proies, predateurs = self.simulation.get_population_counts()
         
         # Fond semi-transparent pour le texte
-        info_surface = pygame.Surface((config.WINDOW_WIDTH, 120))
-        info_surface.set_alpha(180)
-        info_surface.fill((0, 0, 0))
-        self.screen.blit(info_surface, (0, 0))
-        
-        # Informations principales
-        texts = [
-            f"Step: {self.simulation.step_count}",
-            f"Proies: {proies}",
-            f"Prédateurs: {predateurs}",
-            f"Vitesse: {self.speed_multiplier:.1f}x"
+        self.screen.blit(self._info_background, (0, 0))
+        
+        # Informations principales (libellé, valeur, couleur)
+        lines = [
+            ("Step: ", str(self.simulation.step_count), (255, 255, 255)),
+            ("Proies: ", str(proies), config.PROIE_COLOR),
+            ("Prédateurs: ", str(predateurs), config.PREDATEUR_COLOR),
+            ("Vitesse: ", f"{self.speed_multiplier:.1f}x", (255, 255, 255))
         ]
         
         y_offset = 10
-        for text in texts:
-            # Couleur selon le type d'info
-            if "Proies" in text:
-                color = config.PROIE_COLOR
-            elif "Prédateurs" in text:
-                color = config.PREDATEUR_COLOR
-            else:
-                color = (255, 255, 255)
-            
-            surface = self.small_font.render(text, True, color)
-            self.screen.blit(surface, (10, y_offset))
+        for label, value, color in lines:
+            self._blit_line(label, value, color, y_offset)
             y_offset += 25
         
         # Message de pause
         if self.paused:
-            pause_text = self.font.render("PAUSE", True, (255, 255, 0))
-            text_rect = pause_text.get_rect(
+            text_rect = self._pause_surface.get_rect(
                 center=(config.WINDOW_WIDTH // 2, config.WINDOW_HEIGHT // 2)
             )
-            self.screen.blit(pause_text, text_rect)
+            self.screen.blit(self._pause_surface, text_rect)
         
         # Contrôles
-        controls = [
-            "ESPACE: Pause | R: Reset | I: Info",
-            "UpArrow/DownArrow: Vitesse | ESC: Quitter"
-        ]
-        
         y_offset = config.WINDOW_HEIGHT - 60
-        for control in controls:
-            surface = self.small_font.render(control, True, (150, 150, 150))
+        for surface in self._control_surfaces:
             self.screen.blit(surface, (10, y_offset))
             y_offset += 25
     
     def run(self):
         """
         Boucle principale d'affichage.
-        Synchronise FPS d'affichage et vitesse de simulation.
+        La simulation avance à cadence fixe (accumulateur de temps réel),
+        indépendamment de l'affichage, rafraîchi au plus FPS fois par
+        seconde et seulement si la grille ou le HUD ont changé.
         """
-        steps_per_frame = max(1, int(config.SIMULATION_SPEED * self.speed_multiplier))
+        frame_time = 1.0 / config.FPS
+        accumulator = 0.0
+        last_time = time.perf_counter()
+        last_draw = last_time - frame_time
         
         while self.running:
             self.handle_events()
             
-            # Exécuter les steps de simulation (si pas en pause)
-            if not self.paused:
-                for _ in range(steps_per_frame):
+            now = time.perf_counter()
+            elapsed = now - last_time
+            last_time = now
+            
+            # Exécuter les steps dus depuis le dernier tour (si pas en pause)
+            # SIMULATION_SPEED steps par image à la cadence nominale FPS
+            tick_rate = config.SIMULATION_SPEED * self.speed_multiplier * config.FPS
+            if self.paused:
+                accumulator = 0.0
+            else:
+                # Retard borné à une image : une simulation trop lente pour la
+                # cadence demandée ralentit au lieu de s'emballer
+                accumulator = min(accumulator + elapsed * tick_rate,
+                                  max(1.0, tick_rate * frame_time))
+                n_ticks = int(accumulator)
+                accumulator -= n_ticks
+                
+                for _ in range(n_ticks):
                     self.simulation.step()
+                    self._dirty = True
                     
                     # Vérifier extinction
                     if self.simulation.is_extinction():
@@ -190,13 +255,22 @@ class PygameViewer:
                         self.paused = True
                         break
             
-            # Rendu graphique
-            self.draw_grid()
-            self.draw_info()
-            pygame.display.flip()
-            
-            # Contrôle du framerate
-            self.clock.tick(config.FPS)
+            # Rendu graphique (au plus FPS fois par seconde)
+            now = time.perf_counter()
+            if self._dirty and now - last_draw >= frame_time:
+                self.draw_grid()
+                self.draw_info()
+                pygame.display.flip()
+                self._dirty = False
+                last_draw = now
+            else:
+                # Rien à faire : attendre la prochaine image (ou, sans rien à
+                # redessiner, une période d'image pour lire les événements)
+                # ou le prochain step dû
+                wake = last_draw + frame_time if self._dirty else now + frame_time
+                if not self.paused:
+                    wake = min(wake, last_time + (1.0 - accumulator) / tick_rate)
+                time.sleep(max(0.0, wake - now))
         
         # Cleanup
         pygame.quit()
@@ -3,86 +3,182 @@ Moteur de simulation principal.
 Gère le cycle de vie : initialisation, step, analyse.
 """
 
-import random
 import numpy as np
-from typing import List, Tuple
+from typing import Any, Dict, Optional, Tuple
 from grid import Grid
-from agents import Proie, Predateur, Animal
+from agents import Animal
+from agents_numba import (NUMBA_AVAILABLE, step_numba, POS_DTYPE, ENERGY_DTYPE,
+                          REPRO_DTYPE, ID_DTYPE, RAND_RANGE)
 import config
 
 
+def default_params() -> Dict[str, Any]:
+    """
+    Retourne les paramètres par défaut définis dans le module config.
+    
+    Returns:
+        Dictionnaire {NOM_PARAMETRE: valeur}
+    """
+    return {name: getattr(config, name) for name in dir(config) if name.isupper()}
+
+
+def merge_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Complète les paramètres fournis avec les valeurs de config.
+    
+    Args:
+        params: Paramètres surchargeant ceux de config (ou None)
+    
+    Returns:
+        Dictionnaire complet {NOM_PARAMETRE: valeur}
+    
+    Raises:
+        ValueError: Si un paramètre n'existe pas dans config
+    """
+    defaults = default_params()
+    unknown = set(params or {}) - set(defaults)
+    if unknown:
+        raise ValueError(f"Paramètres inconnus : {sorted(unknown)}")
+    return {**defaults, **(params or {})}
+
+
 class Simulation:
     """
     Contrôleur principal de la simulation multi-agents.
     Gère l'initialisation, l'évolution temporelle et les statistiques.
     """
     
-    def __init__(self):
-        """Initialise la simulation avec les paramètres de config."""
-        # Configuration du générateur aléatoire
-        if config.RANDOM_SEED is not None:
-            random.seed(config.RANDOM_SEED)
-            np.random.seed(config.RANDOM_SEED)
+    def __init__(self, params: Optional[Dict[str, Any]] = None,
+                 seed: Optional[int] = None):
+        """
+        Initialise la simulation.
+        
+        Args:
+            params: Paramètres surchargeant ceux de config
+                    (ex: {'PROIE_REPRODUCTION_TIME': 4}). Le module config
+                    n'est jamais modifié, ce qui permet de lancer plusieurs
+                    simulations indépendantes dans un même processus.
+            seed: Graine des générateurs aléatoires (None = RANDOM_SEED)
+        """
+        self.params = merge_params(params)
+        self._check_params(self.params)
+        
+        # Générateur aléatoire propre à l'instance (pas d'état global) :
+        # une même graine donne exactement la même trajectoire
+        self.seed = seed if seed is not None else self.params['RANDOM_SEED']
+        self._np_rng = np.random.default_rng(self.seed)
         
-        # Création de la grille
-        self.grid = Grid(config.GRID_WIDTH, config.GRID_HEIGHT, config.TORUS_MODE)
+        # Grille, noyau de calcul et tableaux d'agents
+        self.grid = None
+        self._configure()
         
         # Compteurs
         self.step_count = 0
         self.is_running = False
         
-        # Historique des populations pour analyse
-        self.history = {
-            'step': [],
-            'proies': [],
-            'predateurs': []
-        }
+        # Historique des populations pour analyse : tableaux préalloués
+        # remplis par index (cf. propriété history)
+        self._allocate_history()
         
         # Initialisation des populations
         self._initialize_populations()
     
+    def _configure(self):
+        """
+        Prépare grille (et ses tableaux d'agents) et noyau pour les
+        paramètres courants (la grille est conservée si la taille et la
+        topologie n'ont pas changé).
+        """
+        p = self.params
+        shape = (p['GRID_WIDTH'], p['GRID_HEIGHT'], p['TORUS_MODE'])
+        
+        if (self.grid is None or
+                (self.grid.width, self.grid.height, self.grid.torus) != shape):
+            self.grid = Grid(*shape)
+            # Tampons du step (au plus un agent par case en début de step) :
+            # ordre de traitement et parents des naissances
+            cells = self.grid.width * self.grid.height
+            self._arange = np.arange(cells, dtype=ID_DTYPE)
+            self._order = np.empty(cells, dtype=ID_DTYPE)
+            self._births = np.empty(cells, dtype=ID_DTYPE)
+        
+        self.grid.agent_params = p
+        
+        # Noyau du step : compilé par Numba si disponible, sinon la même
+        # fonction exécutée en Python pur
+        if NUMBA_AVAILABLE and p['USE_NUMBA']:
+            self._step_kernel = step_numba
+        else:
+            self._step_kernel = getattr(step_numba, 'py_func', step_numba)
+    
     def _initialize_populations(self):
         """
         Peuplement initial aléatoire de la grille.
         Utilise un échantillonnage sans remise pour éviter les collisions.
         """
-        total_cells = config.GRID_WIDTH * config.GRID_HEIGHT
-        total_animals = config.PROIE_INITIAL_COUNT + config.PREDATEUR_INITIAL_COUNT
+        p = self.params
+        total_cells = p['GRID_WIDTH'] * p['GRID_HEIGHT']
+        total_animals = p['PROIE_INITIAL_COUNT'] + p['PREDATEUR_INITIAL_COUNT']
+        
+        # Tirage sans remise des cases occupées (indices aplatis y * W + x)
+        flat = self._np_rng.choice(total_cells, size=total_animals, replace=False)
+        xs = flat % p['GRID_WIDTH']
+        ys = flat // p['GRID_WIDTH']
         
+        # Placement des proies puis des prédateurs (grille vide au préalable)
+        n = p['PROIE_INITIAL_COUNT']
+        self.grid.spawn(xs[:n], ys[:n], config.PROIE_SYMBOL)
+        self.grid.spawn(xs[n:], ys[n:], config.PREDATEUR_SYMBOL,
+                        p['PREDATEUR_INITIAL_ENERGY'])
+        
+        # Enregistrer l'état initial
+        self._record_statistics()
+    
+    @staticmethod
+    def _check_params(p: Dict[str, Any]):
+        """
+        Vérifie que les paramètres tiennent dans les types entiers réduits
+        des tableaux d'agents (moins de mémoire parcourue à chaque step)
+        et que la population initiale tient dans la grille.
+        
+        Args:
+            p: Paramètres complets (cf. merge_params)
+        
+        Raises:
+            ValueError: Si un paramètre dépasse la capacité de son type
+                        ou s'il y a plus d'animaux que de cases
+        """
+        limits = {
+            'GRID_WIDTH': POS_DTYPE, 'GRID_HEIGHT': POS_DTYPE,
+            'PREDATEUR_INITIAL_ENERGY': ENERGY_DTYPE,
+            'PREDATEUR_ENERGY_GAIN': ENERGY_DTYPE,
+            'PROIE_REPRODUCTION_TIME': REPRO_DTYPE,
+            'PREDATEUR_REPRODUCTION_TIME': REPRO_DTYPE
+        }
+        for name, dtype in limits.items():
+            if p[name] > np.iinfo(dtype).max:
+                raise ValueError(
+                    f"{name}={p[name]} dépasse la capacité de {np.dtype(dtype).name}"
+                )
+        
+        total_cells = p['GRID_WIDTH'] * p['GRID_HEIGHT']
+        total_animals = p['PROIE_INITIAL_COUNT'] + p['PREDATEUR_INITIAL_COUNT']
         if total_animals > total_cells:
             raise ValueError(
                 f"Trop d'animaux ({total_animals}) pour la grille ({total_cells} cases)"
             )
+    
+    def get_agent(self, x: int, y: int) -> Optional[Animal]:
+        """
+        Retourne une copie de l'agent situé en (x, y) (cf. Grid.get_agent).
         
-        # Génération de positions aléatoires uniques
-        all_positions = [
-            (x, y) 
-            for x in range(config.GRID_WIDTH) 
-            for y in range(config.GRID_HEIGHT)
-        ]
-        random.shuffle(all_positions)
-        
-        # Placement des proies
-        for i in range(config.PROIE_INITIAL_COUNT):
-            x, y = all_positions[i]
-            proie = Proie(x, y, config.PROIE_REPRODUCTION_TIME)
-            self.grid.add_agent(proie)
-        
-        # Placement des prédateurs
-        offset = config.PROIE_INITIAL_COUNT
-        for i in range(config.PREDATEUR_INITIAL_COUNT):
-            x, y = all_positions[offset + i]
-            predateur = Predateur(
-                x, y,
-                config.PREDATEUR_REPRODUCTION_TIME,
-                config.PREDATEUR_INITIAL_ENERGY,
-                config.PREDATEUR_ENERGY_GAIN,
-                config.PREDATEUR_ENERGY_LOSS
-            )
-            self.grid.add_agent(predateur)
+        Args:
+            x, y: Position sur la grille (repliée ou bornée selon la topologie)
         
-        # Enregistrer l'état initial
-        self._record_statistics()
+        Returns:
+            L'agent ou None si la case est vide
+        """
+        return self.grid.get_agent(*self.grid._wrap_position(x, y))
     
     def step(self):
         """
@@ -91,84 +187,84 @@ class Simulation:
         """
         self.step_count += 1
         
-        # Phase 1 : Obtenir tous les agents vivants
-        # Important : copie pour éviter modification pendant itération
-        agents = self.grid.get_all_agents().copy()
-        
-        # Mélange aléatoire pour éviter les biais d'ordre
-        random.shuffle(agents)
-        
-        # Phase 2 : Déplacement et actions
-        new_borns = []  # Liste des nouveaux-nés
-        
-        for agent in agents:
-            if not agent.is_alive:
-                continue
-            
-            # Vieillissement
-            agent.age()
-            
-            # Déplacement
-            old_pos = (agent.x, agent.y)
-            new_pos = agent.move(self.grid)
-            
-            if new_pos != old_pos:
-                self.grid.move_agent(old_pos, new_pos)
-            
-            # Métabolisme (prédateurs uniquement)
-            if isinstance(agent, Predateur):
-                agent.lose_energy()
-            
-            # Reproduction
-            if agent.can_reproduce():
-                offspring = agent.reproduce()
-                if offspring:
-                    new_borns.append(offspring)
-        
-        # Phase 3 : Ajouter les nouveaux-nés
-        for baby in new_borns:
-            # Chercher une case vide adjacente
-            empty_neighbors = self.grid.get_empty_neighbors(baby.x, baby.y)
-            if empty_neighbors:
-                baby.x, baby.y = random.choice(empty_neighbors)
-                self.grid.add_agent(baby)
+        # Phases 1 à 3 : ordre aléatoire, actions, naissances
+        g = self.grid
+        a = g.agent_arrays
+        p = self.params
+        n = g.n_agents
+        # Ordre aléatoire : mélange en place d'une copie de range(n)
+        # (mêmes tirages que permutation(n), sans allocation)
+        order = self._order[:n]
+        order[:] = self._arange[:n]
+        self._np_rng.shuffle(order)
+        # Tous les tirages du step en un seul appel : un par agent (déplacement)
+        # et un par naissance possible
+        rand = self._np_rng.integers(0, RAND_RANGE, size=2 * n, dtype=np.int8)
+        total = self._step_kernel(
+            g.cells, g.ids,
+            a['x'], a['y'], a['energy'], a['repro'], a['species'], a['alive'],
+            n, g._counts, order, rand, self._births,
+            p['PROIE_REPRODUCTION_TIME'], p['PREDATEUR_REPRODUCTION_TIME'],
+            p['PREDATEUR_ENERGY_GAIN'], p['PREDATEUR_ENERGY_LOSS'],
+            g._wrap_x, g._wrap_y
+        )
         
         # Phase 4 : Retirer les morts
-        dead_positions = [
-            (agent.x, agent.y)
-            for agent in agents
-            if not agent.is_alive
-        ]
-        
-        for pos in dead_positions:
-            self.grid.remove_agent(*pos)
+        g.remove_dead(total)
         
         # Phase 5 : Enregistrer les statistiques
-        if config.RECORD_DATA and self.step_count % config.DATA_RECORD_INTERVAL == 0:
+        if (self.params['RECORD_DATA'] and
+                self.step_count % self.params['DATA_RECORD_INTERVAL'] == 0):
             self._record_statistics()
     
+    def _allocate_history(self):
+        """Préalloue l'historique pour MAX_STEPS enregistrements (+ état initial)."""
+        max_steps = self.params['MAX_STEPS']
+        capacity = (max_steps // self.params['DATA_RECORD_INTERVAL'] + 1
+                    if max_steps > 0 else 1024)
+        self._history = {
+            key: np.empty(capacity, dtype=np.int32)
+            for key in ('step', 'proies', 'predateurs')
+        }
+        self._hlen = 0
+    
     def _record_statistics(self):
         """Enregistre l'état actuel des populations."""
-        agents = self.grid.get_all_agents()
+        proies_count, predateurs_count = self.get_population_counts()
         
-        proies_count = sum(1 for a in agents if isinstance(a, Proie))
-        predateurs_count = sum(1 for a in agents if isinstance(a, Predateur))
+        # Simulation prolongée au-delà de MAX_STEPS : doubler la capacité
+        if self._hlen == self._history['step'].size:
+            for key, values in self._history.items():
+                grown = np.empty(2 * values.size, dtype=values.dtype)
+                grown[:self._hlen] = values
+                self._history[key] = grown
         
-        self.history['step'].append(self.step_count)
-        self.history['proies'].append(proies_count)
-        self.history['predateurs'].append(predateurs_count)
+        i = self._hlen
+        self._history['step'][i] = self.step_count
+        self._history['proies'][i] = proies_count
+        self._history['predateurs'][i] = predateurs_count
+        self._hlen += 1
+    
+    @property
+    def history(self) -> Dict[str, np.ndarray]:
+        """
+        Historique des populations enregistrées.
+        
+        Returns:
+            Dictionnaire {'step', 'proies', 'predateurs'} de vues NumPy
+            (longueur = nombre d'enregistrements)
+        """
+        return {key: values[:self._hlen] for key, values in self._history.items()}
     
     def get_population_counts(self) -> Tuple[int, int]:
         """
-        Retourne les compteurs actuels.
+        Retourne les compteurs de la grille (tenus à jour à chaque naissance/mort).
         
         Returns:
             Tuple (nombre_proies, nombre_predateurs)
         """
-        agents = self.grid.get_all_agents()
-        proies = sum(1 for a in agents if isinstance(a, Proie))
-        predateurs = sum(1 for a in agents if isinstance(a, Predateur))
-        return (proies, predateurs)
+        proies, predateurs = self.grid._counts
+        return (int(proies), int(predateurs))
     
     def is_extinction(self) -> bool:
         """
@@ -177,14 +273,37 @@ class Simulation:
         Returns:
             True si au moins une espèce a disparu
         """
-        proies, predateurs = self.get_population_counts()
-        return proies == 0 or predateurs == 0
+        return not self.grid._counts.all()
     
-    def reset(self):
-        """Réinitialise complètement la simulation."""
+    def reset(self, seed: Optional[int] = None,
+              params: Optional[Dict[str, Any]] = None):
+        """
+        Réinitialise la simulation en place : grille, tableaux d'agents et
+        historique sont réutilisés plutôt que réalloués.
+        
+        Args:
+            seed: Nouvelle graine (None = poursuivre le générateur actuel)
+            params: Nouveaux paramètres surchargeant ceux de config
+                    (None = conserver les paramètres actuels)
+        
+        Raises:
+            ValueError: Si les nouveaux paramètres sont invalides (la
+                        simulation est alors laissée intacte)
+        """
+        if params is not None:
+            # Validation complète avant de toucher à l'état courant
+            params = merge_params(params)
+            self._check_params(params)
+            self.params = params
+            self._configure()
+        
+        if seed is not None:
+            self.seed = seed
+            self._np_rng = np.random.default_rng(seed)
+        
         self.grid.clear()
         self.step_count = 0
-        self.history = {'step': [], 'proies': [], 'predateurs': []}
+        self._hlen = 0
         self._initialize_populations()
     
     def export_data(self, filename: str):
@@ -194,17 +313,16 @@ class Simulation:
         Args:
             filename: Chemin du fichier de sortie
         """
-        import csv
+        history = self.history
+        # Lignes formatées en un seul passage puis écrites en une fois
+        # (fin de ligne \r\n comme le module csv)
+        rows = map('{},{},{}\r\n'.format,
+                   history['step'].tolist(),
+                   history['proies'].tolist(),
+                   history['predateurs'].tolist())
         
         with open(filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Step', 'Proies', 'Predateurs'])
-            
-            for i in range(len(self.history['step'])):
-                writer.writerow([
-                    self.history['step'][i],
-                    self.history['proies'][i],
-                    self.history['predateurs'][i]
-                ])
+            f.write('Step,Proies,Predateurs\r\n')
+            f.write(''.join(rows))
         
         print(f"✅ Données exportées : {filename}")
@@ -0,0 +1,291 @@
+"""
+Tests de cohérence du moteur de simulation (agents en tableaux + noyau du step).
+Lancer avec : python -m pytest test_engine.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from simulation import Simulation
+from batch_simulation import BatchSimulation
+from grid import Grid
+from agents import Proie, Predateur
+from agents_numba import DIRECTIONS
+import config
+
+
+# Petite grille où les deux espèces coexistent plus de 100 steps
+# (prédation, famine, naissances et compactage sont tous exercés)
+PARAMS = {
+    'GRID_WIDTH': 40,
+    'GRID_HEIGHT': 30,
+    'PROIE_INITIAL_COUNT': 300,
+    'PREDATEUR_INITIAL_COUNT': 30,
+    'PREDATEUR_ENERGY_GAIN': 2,
+    'PREDATEUR_REPRODUCTION_TIME': 12
+}
+N_STEPS = 200
+
+
+def _run(params, seed, n_steps=N_STEPS):
+    """Exécute une simulation et retourne son historique (copies)."""
+    sim = Simulation(params=params, seed=seed)
+    for _ in range(n_steps):
+        sim.step()
+        if sim.is_extinction():
+            break
+    return {key: values.copy() for key, values in sim.history.items()}
+
+
+def _assert_consistent(grid):
+    """Vérifie l'accord entre cells, ids, agent_arrays et _counts."""
+    a = grid.agent_arrays
+    n = grid.n_agents
+    xs, ys = a['x'][:n], a['y'][:n]
+    
+    # Agents compactés : tous vivants dans [0, n_agents)
+    assert a['alive'][:n].all()
+    
+    # Chaque agent occupe sa case, avec son symbole et son indice
+    assert (grid.cells[ys, xs] == a['species'][:n]).all()
+    assert (grid.ids[ys, xs] == np.arange(1, n + 1)).all()
+    
+    # Aucune case occupée sans agent
+    assert np.count_nonzero(grid.cells) == n
+    assert np.count_nonzero(grid.ids) == n
+    
+    # Populations tenues à jour
+    assert grid._counts[0] == np.count_nonzero(a['species'][:n] == config.PROIE_SYMBOL)
+    assert grid._counts[1] == np.count_nonzero(a['species'][:n] == config.PREDATEUR_SYMBOL)
+
+
+@pytest.mark.parametrize('torus', [True, False])
+def test_numba_matches_python(torus):
+    """Noyau compilé et Python pur donnent le même historique."""
+    params = {**PARAMS, 'TORUS_MODE': torus}
+    compiled = _run({**params, 'USE_NUMBA': True}, seed=3)
+    python = _run({**params, 'USE_NUMBA': False}, seed=3)
+    
+    assert compiled['step'].size > 100
+    for key in compiled:
+        np.testing.assert_array_equal(compiled[key], python[key])
+
+
+@pytest.mark.parametrize('torus', [True, False])
+def test_grid_state_consistent(torus):
+    """Après chaque step, grille, indices, tableaux et compteurs concordent."""
+    sim = Simulation(params={**PARAMS, 'TORUS_MODE': torus}, seed=5)
+    _assert_consistent(sim.grid)
+    
+    for _ in range(N_STEPS):
+        sim.step()
+        _assert_consistent(sim.grid)
+        assert sim.get_population_counts() == tuple(sim.grid._counts.tolist())
+        if sim.is_extinction():
+            break
+
+
+def test_reset_matches_fresh_simulation():
+    """reset(seed) reproduit une simulation neuve de même graine."""
+    expected = _run(PARAMS, seed=11)
+    
+    sim = Simulation(params=PARAMS, seed=2)
+    for _ in range(50):
+        sim.step()
+    sim.reset(seed=11)
+    for _ in range(N_STEPS):
+        sim.step()
+        if sim.is_extinction():
+            break
+    
+    for key, values in sim.history.items():
+        np.testing.assert_array_equal(values, expected[key])
+    _assert_consistent(sim.grid)
+
+
+def test_reset_with_params_matches_fresh_simulation():
+    """reset(seed, params) change de paramètres comme une simulation neuve."""
+    other = {**PARAMS, 'GRID_WIDTH': 25, 'PROIE_REPRODUCTION_TIME': 4}
+    expected = _run(other, seed=1)
+    
+    sim = Simulation(params=PARAMS, seed=9)
+    sim.step()
+    sim.reset(seed=1, params=other)
+    assert sim.grid.width == 25
+    for _ in range(N_STEPS):
+        sim.step()
+        if sim.is_extinction():
+            break
+    
+    for key, values in sim.history.items():
+        np.testing.assert_array_equal(values, expected[key])
+
+
+@pytest.mark.parametrize('bad', [
+    {'GRID_WIDTH': 10, 'GRID_HEIGHT': 10},      # trop d'animaux
+    {'PREDATEUR_ENERGY_GAIN': 10 ** 6},         # dépasse ENERGY_DTYPE
+    {'INCONNU': 1}
+])
+def test_reset_with_invalid_params_keeps_state(bad):
+    """Un reset refusé laisse paramètres, grille et agents intacts."""
+    sim = Simulation(params=PARAMS, seed=4)
+    for _ in range(10):
+        sim.step()
+    params = dict(sim.params)
+    cells = sim.grid.cells.copy()
+    counts = sim.get_population_counts()
+    
+    with pytest.raises(ValueError):
+        sim.reset(params={**PARAMS, **bad})
+    
+    assert sim.params == params
+    np.testing.assert_array_equal(sim.grid.cells, cells)
+    assert sim.get_population_counts() == counts
+    _assert_consistent(sim.grid)
+    sim.step()
+
+
+def _predateur(x, y, energy):
+    """Prédateur aux paramètres de config avec l'énergie donnée."""
+    return Predateur(x, y, config.PREDATEUR_REPRODUCTION_TIME, energy,
+                     config.PREDATEUR_ENERGY_GAIN, config.PREDATEUR_ENERGY_LOSS)
+
+
+def test_grid_add_remove_agent():
+    """add_agent / remove_agent tiennent cells, ids et _counts à jour."""
+    grid = Grid(8, 6)
+    grid.add_agent(Proie(1, 2, config.PROIE_REPRODUCTION_TIME))
+    grid.add_agent(Proie(3, 2, config.PROIE_REPRODUCTION_TIME))
+    grid.add_agent(_predateur(5, 4, 7))
+    
+    assert grid.n_agents == 3
+    assert grid._counts.tolist() == [2, 1]
+    assert grid.cells[4, 5] == config.PREDATEUR_SYMBOL
+    assert grid.get_agent(5, 4).energy == 7
+    _assert_consistent(grid)
+    
+    # Retrait du premier agent : les suivants sont décalés, ids suit
+    grid.remove_agent(1, 2)
+    assert grid.n_agents == 2
+    assert grid._counts.tolist() == [1, 1]
+    assert grid.get_agent(1, 2) is None
+    assert grid.ids[2, 3] == 1 and grid.ids[4, 5] == 2
+    _assert_consistent(grid)
+    
+    # Retirer une case vide est sans effet
+    grid.remove_agent(0, 0)
+    assert grid.n_agents == 2
+    _assert_consistent(grid)
+
+
+def test_grid_add_agent_replaces_occupant():
+    """Ajouter un agent sur une case occupée remplace l'occupant."""
+    grid = Grid(8, 6)
+    grid.add_agent(Proie(2, 3, config.PROIE_REPRODUCTION_TIME))
+    grid.add_agent(_predateur(2, 3, 9))
+    
+    assert grid.n_agents == 1
+    assert grid._counts.tolist() == [0, 1]
+    agent = grid.get_agent(2, 3)
+    assert isinstance(agent, Predateur) and agent.energy == 9
+    _assert_consistent(grid)
+
+
+def test_grid_move_agent():
+    """move_agent : déplacement simple, collision refusée, prédation."""
+    grid = Grid(8, 6)
+    grid.add_agent(Proie(1, 1, config.PROIE_REPRODUCTION_TIME))
+    grid.add_agent(Proie(3, 1, config.PROIE_REPRODUCTION_TIME))
+    grid.add_agent(_predateur(4, 1, 5))
+    
+    # Case libre : l'agent change de case
+    grid.move_agent((1, 1), (2, 1))
+    assert grid.cells[1, 1] == 0 and grid.ids[1, 1] == 0
+    assert isinstance(grid.get_agent(2, 1), Proie)
+    _assert_consistent(grid)
+    
+    # Proie contre proie : déplacement annulé
+    grid.move_agent((2, 1), (3, 1))
+    assert grid.n_agents == 3
+    assert isinstance(grid.get_agent(2, 1), Proie)
+    _assert_consistent(grid)
+    
+    # Prédateur sur proie : la proie est mangée, l'énergie augmente
+    grid.move_agent((4, 1), (3, 1))
+    assert grid.n_agents == 2
+    assert grid._counts.tolist() == [1, 1]
+    assert grid.get_agent(4, 1) is None
+    predateur = grid.get_agent(3, 1)
+    assert predateur.energy == 5 + config.PREDATEUR_ENERGY_GAIN
+    _assert_consistent(grid)
+
+
+def test_grid_get_all_agents_matches_arrays():
+    """get_all_agents reflète les tableaux d'agents d'une simulation."""
+    sim = Simulation(params=PARAMS, seed=6)
+    for _ in range(20):
+        sim.step()
+    
+    g = sim.grid
+    a = g.agent_arrays
+    n = g.n_agents
+    agents = g.get_all_agents()
+    
+    assert len(agents) == n
+    assert [(agent.x, agent.y) for agent in agents] == list(
+        zip(a['x'][:n].tolist(), a['y'][:n].tolist()))
+    assert [agent.symbol for agent in agents] == a['species'][:n].tolist()
+    predateurs = a['species'][:n] == config.PREDATEUR_SYMBOL
+    assert [agent.energy for agent in agents if isinstance(agent, Predateur)] == \
+        a['energy'][:n][predateurs].tolist()
+
+
+@pytest.mark.parametrize('torus', [True, False])
+def test_batch_invariants(torus):
+    """Cohérence des réplicas du mode batch au fil des steps."""
+    batch = BatchSimulation(4, params={**PARAMS, 'TORUS_MODE': torus}, seed=1)
+    
+    for _ in range(N_STEPS):
+        frozen = ~batch.active
+        before = batch.cells[frozen].copy()
+        batch.step()
+        
+        # Seuls les prédateurs ont de l'énergie, strictement positive
+        predateurs = batch.cells == config.PREDATEUR_SYMBOL
+        assert (batch.energy[~predateurs] == 0).all()
+        assert (batch.energy[predateurs] > 0).all()
+        
+        # Historique conforme au contenu des grilles
+        history = batch.history
+        assert (history['proies'][:, -1] ==
+                np.count_nonzero(batch.cells == config.PROIE_SYMBOL, axis=(1, 2))).all()
+        assert (history['predateurs'][:, -1] ==
+                np.count_nonzero(predateurs, axis=(1, 2))).all()
+        
+        # Un réplica éteint n'évolue plus
+        np.testing.assert_array_equal(batch.cells[frozen], before)
+        if not batch.active.any():
+            break
+
+
+def test_batch_conflicts_resolved():
+    """Au plus un agent gagne chaque case cible, dans une direction autorisée."""
+    batch = BatchSimulation(3, params={**PARAMS, 'TORUS_MODE': False}, seed=2)
+    
+    for _ in range(20):
+        movers = batch.cells != 0
+        allowed = batch._allowed(batch.cells == 0)
+        winners = batch._resolve_moves(movers, allowed)
+        
+        arrivals = sum(batch._shift(winners[d], dx, dy).astype(int)
+                       for d, (dx, dy) in enumerate(DIRECTIONS))
+        assert arrivals.max() <= 1
+        for d in range(4):
+            assert not (winners[d] & ~(movers & allowed[d])).any()
+        
+        batch.step()